@@ -4,15 +4,35 @@ Enhanced Algorithms Implementation
 Includes advanced sorting, searching, and graph algorithms with performance analysis
 """
 
+import os
+import gc
 import time
+import math
 import random
 import heapq
+import pickle
+from multiprocessing import Pool
 from typing import List, Dict, Any, Optional, Tuple, Callable
 from dataclasses import dataclass
 from collections import defaultdict, deque
 import numpy as np
 import matplotlib.pyplot as plt
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; without it the numeric paths fall back to NumPy
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
 @dataclass
 class AlgorithmResult:
     """Data class for algorithm execution results"""
@@ -24,6 +44,325 @@ class AlgorithmResult:
     result: Any
     complexity: str
 
+def _as_numeric_array(arr: List[Any]) -> Optional[np.ndarray]:
+    """Return arr as a numeric ndarray, or None unless it is all ints or all floats
+
+    Mixed ints and floats would be converted to float64, changing the ints
+    written back and merging large ints that differ only in their low bits.
+    """
+    if isinstance(arr, np.ndarray):
+        return arr if arr.dtype.kind in 'iuf' else None
+    item_types = set(map(type, arr))
+    if item_types != {int} and item_types != {float}:
+        return None
+    values = np.asarray(arr)
+    # Ints too large for int64 come back as an object array
+    return values if values.dtype.kind in 'iuf' else None
+
+def _estimated_operations(n: int) -> int:
+    """Estimated comparison count for an O(n log n) sort of n elements"""
+    return int(n * math.log2(n)) if n > 1 else 0
+
+def _numpy_sort(arr: List[Any], values: np.ndarray, kind: str,
+                operations_counter: List[int]) -> List[Any]:
+    """Sort numeric data with np.sort and write it back into arr in place"""
+    values.sort(kind=kind)
+    if values is not arr:
+        arr[:] = values.tolist()
+    operations_counter[0] += _estimated_operations(len(values))
+    return arr
+
+@njit(cache=True, boundscheck=False)
+def _insertion_sort_nb(a):
+    """Compiled insertion sort; returns the number of comparisons made"""
+    comparisons = 0
+    for i in range(1, a.shape[0]):
+        key = a[i]
+        j = i - 1
+        while j >= 0:
+            comparisons += 1
+            if a[j] > key:
+                a[j + 1] = a[j]
+                j -= 1
+            else:
+                break
+        a[j + 1] = key
+    return comparisons
+
+@njit(cache=True, boundscheck=False)
+def _heapify_nb(a, n, i):
+    """Compiled iterative sift-down; returns the number of comparisons made"""
+    comparisons = 0
+    while True:
+        largest = i
+        left = 2 * i + 1
+        right = 2 * i + 2
+        
+        if left < n:
+            comparisons += 1
+            if a[left] > a[largest]:
+                largest = left
+        
+        if right < n:
+            comparisons += 1
+            if a[right] > a[largest]:
+                largest = right
+        
+        if largest == i:
+            return comparisons
+        
+        a[i], a[largest] = a[largest], a[i]
+        i = largest
+
+@njit(cache=True, boundscheck=False)
+def _heapsort_nb(a):
+    """Compiled heapsort; returns the number of comparisons made"""
+    n = a.shape[0]
+    comparisons = 0
+    for i in range(n // 2 - 1, -1, -1):
+        comparisons += _heapify_nb(a, n, i)
+    for i in range(n - 1, 0, -1):
+        a[0], a[i] = a[i], a[0]
+        comparisons += _heapify_nb(a, i, 0)
+    return comparisons
+
+@njit(cache=True, boundscheck=False)
+def _mergesort_nb(a):
+    """Compiled bottom-up mergesort over two ping-pong buffers
+    
+    Runs of width 1, 2, 4, ... are merged from src into tgt and the buffers are
+    swapped after every pass, so no memory is allocated inside the loop.
+    Returns the number of comparisons made.
+    """
+    n = a.shape[0]
+    src = a
+    tgt = np.empty_like(a)
+    in_scratch = False
+    comparisons = 0
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i = lo
+            j = mid
+            k = lo
+            while i < mid and j < hi:
+                comparisons += 1
+                if src[i] <= src[j]:
+                    tgt[k] = src[i]
+                    i += 1
+                else:
+                    tgt[k] = src[j]
+                    j += 1
+                k += 1
+            while i < mid:
+                tgt[k] = src[i]
+                i += 1
+                k += 1
+            while j < hi:
+                tgt[k] = src[j]
+                j += 1
+                k += 1
+        src, tgt = tgt, src
+        in_scratch = not in_scratch
+        width *= 2
+    if in_scratch:
+        a[:] = src
+    return comparisons
+
+def _numba_sort(arr: List[Any], values: np.ndarray, kernel: Callable,
+                operations_counter: List[int]) -> List[Any]:
+    """Sort numeric data with a compiled kernel and write it back into arr"""
+    operations_counter[0] += int(kernel(values))
+    if values is not arr:
+        arr[:] = values.tolist()
+    return arr
+
+@njit(cache=True, boundscheck=False)
+def _dijkstra_nb(indptr, indices, weights, source, target):
+    """Compiled Dijkstra over CSR arrays; returns (distances, previous)
+    
+    The priority queue is a binary heap over two parallel arrays with lazy
+    deletion. Each edge is relaxed at most once, so E + 1 slots always suffice.
+    """
+    n = indptr.shape[0] - 1
+    distances = np.full(n, np.inf)
+    previous = np.full(n, -1, dtype=np.int32)
+    visited = np.zeros(n, dtype=np.bool_)
+    heap_keys = np.empty(indices.shape[0] + 1, dtype=np.float64)
+    heap_ids = np.empty(indices.shape[0] + 1, dtype=np.int32)
+    
+    distances[source] = 0.0
+    heap_keys[0] = 0.0
+    heap_ids[0] = source
+    size = 1
+    
+    while size > 0:
+        current_distance = heap_keys[0]
+        u = heap_ids[0]
+        
+        # Pop: move the last entry to the root and sift it down
+        size -= 1
+        if size > 0:
+            key = heap_keys[size]
+            node = heap_ids[size]
+            i = 0
+            while True:
+                child = 2 * i + 1
+                if child >= size:
+                    break
+                if child + 1 < size and heap_keys[child + 1] < heap_keys[child]:
+                    child += 1
+                if heap_keys[child] >= key:
+                    break
+                heap_keys[i] = heap_keys[child]
+                heap_ids[i] = heap_ids[child]
+                i = child
+            heap_keys[i] = key
+            heap_ids[i] = node
+        
+        if visited[u]:
+            continue
+        visited[u] = True
+        
+        if u == target:
+            break
+        
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            candidate = current_distance + weights[k]
+            if candidate < distances[v]:
+                distances[v] = candidate
+                previous[v] = u
+                
+                # Push: sift the new entry up from the end
+                i = size
+                size += 1
+                while i > 0:
+                    parent = (i - 1) // 2
+                    if heap_keys[parent] <= candidate:
+                        break
+                    heap_keys[i] = heap_keys[parent]
+                    heap_ids[i] = heap_ids[parent]
+                    i = parent
+                heap_keys[i] = candidate
+                heap_ids[i] = v
+    
+    return distances, previous
+
+def _dijkstra_heapq(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                    source: int, target: int) -> Tuple[List[float], List[int]]:
+    """Dijkstra over CSR arrays using heapq, for when Numba is unavailable"""
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    weights = weights.tolist()
+    n = len(indptr) - 1
+    distances = [float('infinity')] * n
+    previous = [-1] * n
+    visited = [False] * n
+    
+    distances[source] = 0.0
+    pq = [(0.0, source)]
+    
+    while pq:
+        current_distance, u = heapq.heappop(pq)
+        if visited[u]:
+            continue
+        visited[u] = True
+        
+        if u == target:
+            break
+        
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            candidate = current_distance + weights[k]
+            if candidate < distances[v]:
+                distances[v] = candidate
+                previous[v] = u
+                heapq.heappush(pq, (candidate, v))
+    
+    return distances, previous
+
+@njit(cache=True)
+def _bellman_ford_nb(edges_u, edges_v, weights, num_nodes, source):
+    """Compiled Bellman-Ford over flat edge arrays; returns (distances, has_negative_cycle)"""
+    distances = np.full(num_nodes, np.inf)
+    distances[source] = 0.0
+    num_edges = edges_u.shape[0]
+    
+    # Relax edges V-1 times, stopping early once nothing changes
+    for _ in range(num_nodes - 1):
+        changed = False
+        for e in range(num_edges):
+            candidate = distances[edges_u[e]] + weights[e]
+            if candidate < distances[edges_v[e]]:
+                distances[edges_v[e]] = candidate
+                changed = True
+        if not changed:
+            break
+    
+    # Check for negative cycles
+    for e in range(num_edges):
+        if distances[edges_u[e]] + weights[e] < distances[edges_v[e]]:
+            return distances, True
+    
+    return distances, False
+
+FLOYD_WARSHALL_BLOCK = 64  # Tile edge; a 64x64 float64 tile is 32 KiB
+
+@njit(cache=True, boundscheck=False)
+def _floyd_warshall_tile(distances, k0, k1, i0, i1, j0, j1):
+    """Relax tile [i0:i1, j0:j1] through the intermediate nodes k0..k1-1"""
+    for k in range(k0, k1):
+        for i in range(i0, i1):
+            dik = distances[i, k]
+            if dik == np.inf:
+                continue
+            for j in range(j0, j1):
+                candidate = dik + distances[k, j]
+                if candidate < distances[i, j]:
+                    distances[i, j] = candidate
+
+@njit(cache=True, parallel=True)
+def _floyd_warshall_nb(distances, block):
+    """Compiled, cache-blocked in-place Floyd-Warshall
+    
+    For each diagonal tile kb (sequentially): relax the diagonal tile itself,
+    then the tiles sharing its row or column, then every remaining tile. Tiles
+    within the last two phases are independent and run in parallel.
+    """
+    n = distances.shape[0]
+    num_blocks = (n + block - 1) // block
+    for kb in range(num_blocks):
+        k0 = kb * block
+        k1 = min(k0 + block, n)
+        
+        _floyd_warshall_tile(distances, k0, k1, k0, k1, k0, k1)
+        
+        for b in prange(num_blocks):
+            if b != kb:
+                b0 = b * block
+                b1 = min(b0 + block, n)
+                _floyd_warshall_tile(distances, k0, k1, k0, k1, b0, b1)
+                _floyd_warshall_tile(distances, k0, k1, b0, b1, k0, k1)
+        
+        for ib in prange(num_blocks):
+            if ib != kb:
+                i0 = ib * block
+                i1 = min(i0 + block, n)
+                for jb in range(num_blocks):
+                    if jb != kb:
+                        j0 = jb * block
+                        _floyd_warshall_tile(distances, k0, k1, i0, i1, j0, min(j0 + block, n))
+
+def _floyd_warshall_numpy(distances: np.ndarray) -> None:
+    """In-place Floyd-Warshall with one fused broadcast per intermediate node"""
+    for k in range(distances.shape[0]):
+        np.minimum(distances, distances[:, k:k + 1] + distances[k:k + 1, :], out=distances)
+
+QUICKSORT_INSERTION_CUTOFF = 16  # Partitions smaller than this use insertion sort
+
 class AdvancedSortingAlgorithms:
     """Advanced sorting algorithms with performance tracking"""
     
@@ -33,12 +372,22 @@ class AdvancedSortingAlgorithms:
         if operations_counter is None:
             operations_counter = [0]
         
+        # Numeric input is sorted natively by NumPy
+        values = _as_numeric_array(arr)
+        if values is not None:
+            return _numpy_sort(arr, values, 'quicksort', operations_counter)
+        
         def partition(low: int, high: int) -> int:
-            # Median-of-three pivot selection
+            # Median-of-three pivot selection on cached values, no list allocation
             mid = (low + high) // 2
-            pivot_candidates = [arr[low], arr[mid], arr[high]]
-            pivot_candidates.sort()
-            pivot = pivot_candidates[1]
+            a, b, c = arr[low], arr[mid], arr[high]
+            if a > b:
+                a, b = b, a
+            if b > c:
+                b, c = c, b
+            if a > b:
+                a, b = b, a
+            pivot = b
             
             # Find pivot index
             if pivot == arr[low]:
@@ -54,7 +403,6 @@ class AdvancedSortingAlgorithms:
             
             i = low - 1
             for j in range(low, high):
-                operations_counter[0] += 1
                 if arr[j] <= pivot:
                     i += 1
                     arr[i], arr[j] = arr[j], arr[i]
@@ -62,9 +410,24 @@ class AdvancedSortingAlgorithms:
             arr[i + 1], arr[high] = arr[high], arr[i + 1]
             return i + 1
         
+        def insertion_sort_range(low: int, high: int):
+            # Small partitions finish faster with insertion sort
+            for i in range(low + 1, high + 1):
+                key = arr[i]
+                j = i - 1
+                while j >= low and arr[j] > key:
+                    arr[j + 1] = arr[j]
+                    j -= 1
+                arr[j + 1] = key
+                operations_counter[0] += i - j if j >= low else i - low
+        
         def quicksort_helper(low: int, high: int):
-            if low < high:
+            if high - low < QUICKSORT_INSERTION_CUTOFF:
+                insertion_sort_range(low, high)
+            else:
                 pi = partition(low, high)
+                # partition compares every element of [low, high) to the pivot
+                operations_counter[0] += high - low
                 quicksort_helper(low, pi - 1)
                 quicksort_helper(pi + 1, high)
         
@@ -77,35 +440,53 @@ class AdvancedSortingAlgorithms:
         if operations_counter is None:
             operations_counter = [0]
         
+        # Numeric input is sorted natively
+        values = _as_numeric_array(arr)
+        if values is not None:
+            if NUMBA_AVAILABLE:
+                return _numba_sort(arr, values, _mergesort_nb, operations_counter)
+            return _numpy_sort(arr, values, 'stable', operations_counter)
+        
         def merge(left: List[Any], right: List[Any]) -> List[Any]:
-            result = []
-            i = j = 0
+            n_left = len(left)
+            n_right = len(right)
+            result = [None] * (n_left + n_right)
+            i = j = k = 0
             
-            while i < len(left) and j < len(right):
-                operations_counter[0] += 1
+            while i < n_left and j < n_right:
                 if left[i] <= right[j]:
-                    result.append(left[i])
+                    result[k] = left[i]
                     i += 1
                 else:
-                    result.append(right[j])
+                    result[k] = right[j]
                     j += 1
+                k += 1
             
-            result.extend(left[i:])
-            result.extend(right[j:])
+            # Each comparison consumed exactly one element
+            operations_counter[0] += k
+            
+            # Copy whichever run is left over into the tail
+            if i < n_left:
+                result[k:] = left[i:]
+            else:
+                result[k:] = right[j:]
             return result
         
-        if len(arr) <= 1:
-            return arr
-        
-        # Use insertion sort for small arrays
-        if len(arr) <= 10:
-            return AdvancedSortingAlgorithms.insertion_sort(arr, operations_counter)
-        
-        mid = len(arr) // 2
-        left = AdvancedSortingAlgorithms.mergesort_optimized(arr[:mid], operations_counter)
-        right = AdvancedSortingAlgorithms.mergesort_optimized(arr[mid:], operations_counter)
+        def mergesort_helper(arr: List[Any]) -> List[Any]:
+            if len(arr) <= 1:
+                return arr
+            
+            # Use insertion sort for small arrays
+            if len(arr) <= 10:
+                return AdvancedSortingAlgorithms.insertion_sort(arr, operations_counter)
+            
+            mid = len(arr) // 2
+            left = mergesort_helper(arr[:mid])
+            right = mergesort_helper(arr[mid:])
+            
+            return merge(left, right)
         
-        return merge(left, right)
+        return mergesort_helper(arr)
     
     @staticmethod
     def heapsort_optimized(arr: List[Any], operations_counter: List[int] = None) -> List[Any]:
@@ -113,36 +494,50 @@ class AdvancedSortingAlgorithms:
         if operations_counter is None:
             operations_counter = [0]
         
-        def heapify(arr: List[Any], n: int, i: int):
-            largest = i
-            left = 2 * i + 1
-            right = 2 * i + 2
-            
-            if left < n:
-                operations_counter[0] += 1
-                if arr[left] > arr[largest]:
-                    largest = left
-            
-            if right < n:
-                operations_counter[0] += 1
-                if arr[right] > arr[largest]:
-                    largest = right
-            
-            if largest != i:
+        # Numeric input is sorted natively
+        values = _as_numeric_array(arr)
+        if values is not None:
+            if NUMBA_AVAILABLE:
+                return _numba_sort(arr, values, _heapsort_nb, operations_counter)
+            return _numpy_sort(arr, values, 'heapsort', operations_counter)
+        
+        def heapify(arr: List[Any], n: int, i: int) -> int:
+            """Iterative sift-down; returns the number of comparisons made"""
+            comparisons = 0
+            while True:
+                largest = i
+                left = 2 * i + 1
+                right = 2 * i + 2
+                
+                if left < n:
+                    comparisons += 1
+                    if arr[left] > arr[largest]:
+                        largest = left
+                
+                if right < n:
+                    comparisons += 1
+                    if arr[right] > arr[largest]:
+                        largest = right
+                
+                if largest == i:
+                    return comparisons
+                
                 arr[i], arr[largest] = arr[largest], arr[i]
-                heapify(arr, n, largest)
+                i = largest
         
         n = len(arr)
+        comparisons = 0
         
         # Build max heap (bottom-up approach)
         for i in range(n // 2 - 1, -1, -1):
-            heapify(arr, n, i)
+            comparisons += heapify(arr, n, i)
         
         # Extract elements from heap one by one
         for i in range(n - 1, 0, -1):
             arr[0], arr[i] = arr[i], arr[0]
-            heapify(arr, i, 0)
+            comparisons += heapify(arr, i, 0)
         
+        operations_counter[0] += comparisons
         return arr
     
     @staticmethod
@@ -151,17 +546,24 @@ class AdvancedSortingAlgorithms:
         if operations_counter is None:
             operations_counter = [0]
         
+        # Numeric input runs through the compiled kernel when Numba is available
+        if NUMBA_AVAILABLE:
+            values = _as_numeric_array(arr)
+            if values is not None:
+                return _numba_sort(arr, values, _insertion_sort_nb, operations_counter)
+        
         for i in range(1, len(arr)):
             key = arr[i]
             j = i - 1
             while j >= 0:
-                operations_counter[0] += 1
                 if arr[j] > key:
                     arr[j + 1] = arr[j]
                     j -= 1
                 else:
                     break
             arr[j + 1] = key
+            # One comparison per shift, plus the one that stopped the scan
+            operations_counter[0] += i - j if j >= 0 else i
         
         return arr
     
@@ -183,6 +585,11 @@ class AdvancedSearchingAlgorithms:
         if operations_counter is None:
             operations_counter = [0]
         
+        # Arrays are searched natively; converting a list would cost O(n)
+        if isinstance(arr, np.ndarray):
+            index = AdvancedSearchingAlgorithms.binary_search_batch(arr, [target], operations_counter)[0]
+            return int(index) if index >= 0 else None
+        
         left, right = 0, len(arr) - 1
         
         while left <= right:
@@ -198,6 +605,28 @@ class AdvancedSearchingAlgorithms:
         
         return None
     
+    @staticmethod
+    def binary_search_batch(arr: List[Any], targets: List[Any], operations_counter: List[int] = None) -> np.ndarray:
+        """Binary search for many targets at once using np.searchsorted
+        
+        Returns an array holding the index of each target in arr, or -1 where
+        the target is absent.
+        """
+        if operations_counter is None:
+            operations_counter = [0]
+        
+        values = np.asarray(arr)
+        queries = np.asarray(targets)
+        n = len(values)
+        if n == 0:
+            return np.full(queries.shape, -1, dtype=np.intp)
+        
+        indices = np.searchsorted(values, queries, side='left')
+        hit = (indices < n) & (values[np.clip(indices, 0, n - 1)] == queries)
+        operations_counter[0] += queries.size * n.bit_length()
+        
+        return np.where(hit, indices, -1)
+    
     @staticmethod
     def interpolation_search(arr: List[Any], target: Any, operations_counter: List[int] = None) -> Optional[int]:
         """Interpolation search for uniformly distributed data"""
@@ -251,96 +680,120 @@ class GraphAlgorithms:
     def __init__(self):
         self.graph = defaultdict(list)
         self.weights = {}
+        # Edge list in insertion order, packed into arrays by finalize()
+        self._edge_sources = []
+        self._edge_targets = []
+        self._edge_weights = []
+        self._finalized = False
     
     def add_edge(self, u: Any, v: Any, weight: float = 1.0):
         """Add a weighted edge to the graph"""
         self.graph[u].append(v)
         self.weights[(u, v)] = weight
+        self._edge_sources.append(u)
+        self._edge_targets.append(v)
+        self._edge_weights.append(weight)
+        self._finalized = False
+    
+    def finalize(self) -> None:
+        """Pack the edge list into arrays for the array-based algorithms
+        
+        Builds both a flat edge list (edges_u, edges_v, edge_weights) and its CSR
+        form (indptr, indices, csr_weights). Nodes are numbered in first-seen
+        order, including nodes that only appear as edge targets. Called
+        automatically when the graph has changed.
+        """
+        nodes = list(self.graph.keys())
+        node_ids = {node: i for i, node in enumerate(nodes)}
+        for v in self._edge_targets:
+            if v not in node_ids:
+                node_ids[v] = len(nodes)
+                nodes.append(v)
+        
+        edges_u = np.fromiter((node_ids[u] for u in self._edge_sources), dtype=np.int32,
+                              count=len(self._edge_sources))
+        edges_v = np.fromiter((node_ids[v] for v in self._edge_targets), dtype=np.int32,
+                              count=len(self._edge_targets))
+        edge_weights = np.array(self._edge_weights, dtype=np.float64)
+        
+        # A stable sort by source keeps each adjacency list in insertion order
+        order = np.argsort(edges_u, kind='stable')
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(edges_u, minlength=len(nodes)), out=indptr[1:])
+        
+        self._nodes = nodes
+        self._node_ids = node_ids
+        self._edges_u = edges_u
+        self._edges_v = edges_v
+        self._edge_weight_array = edge_weights
+        self._indptr = indptr
+        self._indices = edges_v[order]
+        self._csr_weights = edge_weights[order]
+        self._finalized = True
+    
+    def _ensure_finalized(self) -> None:
+        if not self._finalized:
+            self.finalize()
     
     def dijkstra_shortest_path(self, start: Any, end: Any) -> Tuple[List[Any], float]:
         """Dijkstra's shortest path algorithm with priority queue"""
-        distances = {node: float('infinity') for node in self.graph}
-        distances[start] = 0
-        previous = {}
+        self._ensure_finalized()
+        if start not in self._node_ids or end not in self._node_ids:
+            return [end], (0.0 if start == end else float('infinity'))
         
-        pq = [(0, start)]
-        visited = set()
-        
-        while pq:
-            current_distance, current_node = heapq.heappop(pq)
-            
-            if current_node in visited:
-                continue
-            
-            visited.add(current_node)
-            
-            if current_node == end:
-                break
-            
-            for neighbor in self.graph[current_node]:
-                weight = self.weights.get((current_node, neighbor), 1.0)
-                distance = current_distance + weight
-                
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    previous[neighbor] = current_node
-                    heapq.heappush(pq, (distance, neighbor))
+        source = self._node_ids[start]
+        target = self._node_ids[end]
+        dijkstra = _dijkstra_nb if NUMBA_AVAILABLE else _dijkstra_heapq
+        distances, previous = dijkstra(self._indptr, self._indices, self._csr_weights, source, target)
         
         # Reconstruct path
         path = []
-        current = end
-        while current is not None:
-            path.append(current)
-            current = previous.get(current)
+        current = target
+        while current != -1:
+            path.append(self._nodes[current])
+            current = previous[current]
         path.reverse()
         
-        return path, distances[end]
+        return path, float(distances[target])
     
     def bellman_ford(self, start: Any) -> Dict[Any, float]:
         """Bellman-Ford algorithm for negative weight detection"""
-        distances = {node: float('infinity') for node in self.graph}
-        distances[start] = 0
-        
-        # Relax edges V-1 times
-        for _ in range(len(self.graph) - 1):
-            for u in self.graph:
-                for v in self.graph[u]:
-                    weight = self.weights.get((u, v), 1.0)
-                    if distances[u] + weight < distances[v]:
-                        distances[v] = distances[u] + weight
-        
-        # Check for negative cycles
-        for u in self.graph:
-            for v in self.graph[u]:
-                weight = self.weights.get((u, v), 1.0)
-                if distances[u] + weight < distances[v]:
-                    raise ValueError("Negative cycle detected")
-        
-        return distances
+        self._ensure_finalized()
+        if start not in self._node_ids:
+            distances = {node: float('infinity') for node in self._nodes}
+            distances[start] = 0
+            return distances
+        
+        distances, has_negative_cycle = _bellman_ford_nb(
+            self._edges_u, self._edges_v, self._edge_weight_array,
+            len(self._nodes), self._node_ids[start]
+        )
+        if has_negative_cycle:
+            raise ValueError("Negative cycle detected")
+        
+        return dict(zip(self._nodes, distances.tolist()))
     
     def floyd_warshall(self) -> Dict[Tuple[Any, Any], float]:
         """Floyd-Warshall algorithm for all-pairs shortest paths"""
-        nodes = list(self.graph.keys())
-        distances = {}
-        
-        # Initialize distances
-        for u in nodes:
-            for v in nodes:
-                if u == v:
-                    distances[(u, v)] = 0
-                elif v in self.graph[u]:
-                    distances[(u, v)] = self.weights.get((u, v), 1.0)
-                else:
-                    distances[(u, v)] = float('infinity')
+        self._ensure_finalized()
+        nodes = self._nodes
+        n = len(nodes)
+        
+        # Dense distance matrix; parallel edges keep their lightest weight
+        distances = np.full((n, n), np.inf)
+        sources = np.repeat(np.arange(n), np.diff(self._indptr))
+        np.minimum.at(distances, (sources, self._indices), self._csr_weights)
+        np.fill_diagonal(distances, 0.0)
         
-        # Floyd-Warshall algorithm
-        for k in nodes:
-            for i in nodes:
-                for j in nodes:
-                    if distances[(i, k)] + distances[(k, j)] < distances[(i, j)]:
-                        distances[(i, j)] = distances[(i, k)] + distances[(k, j)]
+        if NUMBA_AVAILABLE:
+            _floyd_warshall_nb(distances, FLOYD_WARSHALL_BLOCK)
+        else:
+            _floyd_warshall_numpy(distances)
         
-        return distances
+        rows = distances.tolist()
+        return {(u, v): rows[i][j] for i, u in enumerate(nodes) for j, v in enumerate(nodes)}
+
+WARMUP_SIZE = 64  # Elements run untimed before benchmarking an algorithm
 
 class PerformanceAnalyzer:
     """Performance analysis and benchmarking tools"""
@@ -358,10 +811,17 @@ class PerformanceAnalyzer:
         test_data = data.copy()
         operations_counter = [0]
         
-        # Measure execution time
-        start_time = time.time()
-        result = algorithm(test_data, operations_counter)
-        execution_time = time.time() - start_time
+        # Measure execution time with the monotonic high-resolution clock,
+        # keeping garbage collection pauses out of the timed region
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start_time = time.perf_counter_ns()
+            result = algorithm(test_data, operations_counter)
+            execution_time = (time.perf_counter_ns() - start_time) / 1e9
+        finally:
+            if gc_was_enabled:
+                gc.enable()
         
         # Estimate memory usage (simplified)
         memory_usage = len(test_data) * 8  # Assume 8 bytes per element
@@ -378,34 +838,67 @@ class PerformanceAnalyzer:
     
     def _estimate_complexity(self, algorithm_name: str, input_size: int, operations: int) -> str:
         """Estimate time complexity based on operations count"""
+        n_log_n = input_size * math.log2(input_size) if input_size > 1 else 0
+        n_squared = input_size * input_size
+        
         if operations <= input_size:
             return "O(n)"
-        elif operations <= input_size * np.log2(input_size):
+        elif operations <= n_log_n:
             return "O(n log n)"
-        elif operations <= input_size ** 2:
+        elif operations <= n_squared:
             return "O(n²)"
-        elif operations <= input_size ** 3:
+        elif operations <= n_squared * input_size:
             return "O(n³)"
         else:
             return "O(2ⁿ)"
     
     def compare_algorithms(self, algorithms: Dict[str, Callable], 
-                         data_sizes: List[int], data_generator: Callable = None) -> Dict[str, List[AlgorithmResult]]:
-        """Compare multiple algorithms across different data sizes"""
+                         data_sizes: List[int], data_generator: Callable = None,
+                         processes: int = None) -> Dict[str, List[AlgorithmResult]]:
+        """Compare multiple algorithms across different data sizes
+        
+        Each (size, algorithm) benchmark runs in its own worker process. Workers
+        regenerate their input from a per-size seed, so every algorithm sees the
+        same data without it being pickled across the pipe. Falls back to a serial
+        run when processes == 1 or the callables cannot be pickled (e.g. lambdas).
+        
+        Concurrent benchmarks share cores and memory bandwidth, so their times
+        are only roughly comparable with each other; pass processes=1 for
+        timings taken one at a time. Either way, each algorithm is run once on
+        a small slice of the input before timing, so Numba compilation or
+        cache loading is not counted.
+        """
         if data_generator is None:
-            data_generator = lambda size: [random.randint(1, 1000) for _ in range(size)]
+            data_generator = _default_data_generator
         
         results = {name: [] for name in algorithms.keys()}
         
-        for size in data_sizes:
-            data = data_generator(size)
-            
-            for name, algorithm in algorithms.items():
-                try:
-                    result = self.benchmark_algorithm(algorithm, data, name)
-                    results[name].append(result)
-                except Exception as e:
-                    print(f"Error benchmarking {name} with size {size}: {e}")
+        if processes != 1 and _is_picklable((algorithms, data_generator)):
+            seeds = [random.randrange(2 ** 32) for _ in data_sizes]
+            tasks = [(name, algorithm, size, data_generator, seed)
+                     for size, seed in zip(data_sizes, seeds)
+                     for name, algorithm in algorithms.items()]
+            with Pool(processes or os.cpu_count()) as pool:
+                raw = pool.starmap(_bench_worker, tasks)
+        else:
+            raw = []
+            warmed = set()
+            for size in data_sizes:
+                data = data_generator(size)
+                for name, algorithm in algorithms.items():
+                    try:
+                        if name not in warmed:
+                            _warm_up(algorithm, data)
+                            warmed.add(name)
+                        raw.append((name, size, self.benchmark_algorithm(algorithm, data, name), None))
+                    except Exception as e:
+                        raw.append((name, size, None, e))
+        
+        for name, size, result, error in raw:
+            if error is not None:
+                print(f"Error benchmarking {name} with size {size}: {error}")
+            else:
+                results[name].append(result)
         
         return results
     
@@ -445,6 +938,42 @@ class PerformanceAnalyzer:
         plt.xscale('log')
         plt.show()
 
+def _default_data_generator(size: int) -> np.ndarray:
+    """Random integers in [1, 1000], used when no data generator is supplied
+    
+    Filled by NumPy in one call; the sorters consume the array directly.
+    Draws from the global NumPy RNG so worker seeding applies.
+    """
+    return np.random.randint(1, 1001, size=size, dtype=np.int64)
+
+def _is_picklable(obj: Any) -> bool:
+    """Check whether obj can be sent to a worker process"""
+    try:
+        pickle.dumps(obj)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+def _warm_up(algorithm: Callable, data: List[Any]) -> None:
+    """Run algorithm untimed on a copy of the head of data
+    
+    Same element type as the timed run, so Numba kernels are compiled or
+    loaded from cache before timing starts.
+    """
+    algorithm(data[:WARMUP_SIZE].copy(), [0])
+
+def _bench_worker(name: str, algorithm: Callable, size: int,
+                  data_generator: Callable, seed: int) -> Tuple[str, int, Optional[AlgorithmResult], Optional[str]]:
+    """Benchmark one (algorithm, size) pair inside a worker process"""
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        data = data_generator(size)
+        _warm_up(algorithm, data)
+        return name, size, PerformanceAnalyzer().benchmark_algorithm(algorithm, data, name), None
+    except Exception as e:
+        return name, size, None, str(e)
+
 class AlgorithmComparator:
     """Advanced algorithm comparison and selection tools"""
     
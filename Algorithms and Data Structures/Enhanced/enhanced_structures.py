@@ -8,6 +8,44 @@ from typing import Optional, List, Any, Dict, Tuple
 from enum import Enum
 import random
 import math
+import bisect
+import heapq
+from array import array
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; without it the union-find kernels run as plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    import marisa_trie
+    MARISA_AVAILABLE = True
+except ImportError:
+    # marisa-trie is optional; without it Trie.freeze() builds a TrieArena
+    MARISA_AVAILABLE = False
+
+def keys_dtype(keys) -> np.dtype:
+    """NumPy dtype that holds keys unchanged, for the to_numpy() methods
+    
+    int64 or float64 when the keys are all ints (within int64) or all
+    floats; object for anything else, such as strings or ints mixed with
+    floats, which a numeric dtype would truncate or round.
+    """
+    item_types = set(map(type, keys))
+    if item_types == {int} or item_types == {float}:
+        dtype = np.asarray(keys).dtype
+        if dtype.kind in 'if':
+            return dtype
+    return np.dtype(object)
 
 class Color(Enum):
     """Color enum for Red-Black Tree nodes"""
@@ -17,6 +55,8 @@ class Color(Enum):
 class RedBlackTreeNode:
     """Node class for Red-Black Tree"""
     
+    __slots__ = ('key', 'color', 'left', 'right', 'parent')
+    
     def __init__(self, key: Any, color: Color = Color.RED):
         self.key = key
         self.color = color
@@ -133,15 +173,26 @@ class RedBlackTree:
         return result
     
     def _inorder_helper(self, node: RedBlackTreeNode, result: List[Any]) -> None:
-        """Helper function for inorder traversal"""
-        if node != self.nil:
-            self._inorder_helper(node.left, result)
-            result.append(node.key)
-            self._inorder_helper(node.right, result)
+        """Helper function for inorder traversal (iterative, explicit stack)"""
+        nil = self.nil
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        append = result.append
+        
+        while stack or node is not nil:
+            while node is not nil:
+                push(node)
+                node = node.left
+            node = pop()
+            append(node.key)
+            node = node.right
 
 class BTreeNode:
     """Node class for B-Tree"""
     
+    __slots__ = ('leaf', 'keys', 'children')
+    
     def __init__(self, leaf: bool = True):
         self.leaf = leaf
         self.keys = []
@@ -155,9 +206,14 @@ class BTree:
         self.degree = degree
         self.min_keys = degree - 1
         self.max_keys = 2 * degree - 1
+        self.length = 0
+    
+    def __len__(self) -> int:
+        return self.length
     
     def insert(self, key: Any) -> None:
         """Insert a key into the B-Tree"""
+        self.length += 1
         root = self.root
         
         # If root is full, split it
@@ -169,22 +225,67 @@ class BTree:
         
         self._insert_non_full(self.root, key)
     
+    def insert_many(self, keys) -> None:
+        """Insert many keys at once
+        
+        When the batch is at least as large as the tree, the whole tree is
+        rebuilt bottom-up from sorted keys instead of descending per key.
+        """
+        keys = list(keys)
+        if len(keys) < self.length:
+            for key in keys:
+                self.insert(key)
+            return
+        
+        if self.length:
+            keys.extend(self.traverse())
+        keys.sort()
+        self.length = len(keys)
+        self.root = self._bulk_load(keys)
+    
+    def _bulk_load(self, keys: List[Any]) -> BTreeNode:
+        """Build a B-Tree from sorted keys one level at a time, leaves first"""
+        children = None
+        while len(keys) > self.max_keys:
+            # Each node takes up to max_keys keys plus one separator for the
+            # level above; spreading keys evenly keeps every node >= min_keys
+            count = -(-(len(keys) + 1) // (self.max_keys + 1))
+            per_node, extra = divmod(len(keys) - (count - 1), count)
+            
+            nodes = []
+            separators = []
+            pos = 0
+            child_pos = 0
+            for j in range(count):
+                size = per_node + (j < extra)
+                node = BTreeNode(leaf=children is None)
+                node.keys = keys[pos:pos + size]
+                if children is not None:
+                    node.children = children[child_pos:child_pos + size + 1]
+                    child_pos += size + 1
+                nodes.append(node)
+                pos += size
+                if j < count - 1:
+                    separators.append(keys[pos])
+                    pos += 1
+            
+            keys = separators
+            children = nodes
+        
+        root = BTreeNode(leaf=children is None)
+        root.keys = keys
+        if children is not None:
+            root.children = children
+        return root
+    
     def _insert_non_full(self, node: BTreeNode, key: Any) -> None:
         """Insert key into a non-full node"""
-        i = len(node.keys) - 1
-        
         if node.leaf:
-            # Insert into leaf node - use efficient list operations
-            # Find the correct position
-            while i >= 0 and key < node.keys[i]:
-                i -= 1
-            # Insert at the correct position
-            node.keys.insert(i + 1, key)
+            # Insert into leaf node; bisect finds the slot and shifts in C
+            bisect.insort_right(node.keys, key)
         else:
             # Find child to insert into
-            while i >= 0 and key < node.keys[i]:
-                i -= 1
-            i += 1
+            i = bisect.bisect_right(node.keys, key)
             
             # Split child if full
             if len(node.children[i].keys) == self.max_keys:
@@ -219,192 +320,592 @@ class BTree:
         return result
     
     def _traverse_helper(self, node: BTreeNode, result: List[Any]) -> None:
-        """Helper function for traversal"""
+        """Helper function for traversal (iterative, stack of (node, child_index))"""
         if node is None:
             return
         
-        for i in range(len(node.keys)):
-            if not node.leaf:
-                self._traverse_helper(node.children[i], result)
-            result.append(node.keys[i])
+        append = result.append
+        stack = [(node, 0)]
+        push = stack.append
+        pop = stack.pop
         
-        if not node.leaf:
-            self._traverse_helper(node.children[-1], result)
-
-class SkipListNode:
-    """Node class for Skip List"""
+        while stack:
+            node, i = pop()
+            if node.leaf:
+                result.extend(node.keys)
+                continue
+            
+            # Emit the key that separates child i-1 from child i, then descend
+            if i > 0:
+                append(node.keys[i - 1])
+            if i < len(node.keys):
+                push((node, i + 1))
+            push((node.children[i], 0))
     
-    def __init__(self, key: Any, level: int):
-        self.key = key
-        self.forward = [None] * (level + 1)
+    def to_numpy(self, dtype=np.int64) -> np.ndarray:
+        """In-order keys as a NumPy array, filled without an intermediate list
+        
+        dtype must hold the keys; keys_dtype() picks one for arbitrary data.
+        """
+        result = np.empty(self.length, dtype=dtype)
+        pos = 0
+        stack = [(self.root, 0)]
+        
+        while stack:
+            node, i = stack.pop()
+            if node.leaf:
+                # A whole leaf is one slice assignment
+                end = pos + len(node.keys)
+                result[pos:end] = node.keys
+                pos = end
+                continue
+            
+            if i > 0:
+                result[pos] = node.keys[i - 1]
+                pos += 1
+            if i < len(node.keys):
+                stack.append((node, i + 1))
+            stack.append((node.children[i], 0))
+        
+        return result
+
+NIL = -1  # Null link in the index-based skip list
 
 class SkipList:
-    """Skip List implementation with probabilistic structure"""
+    """Skip List implementation with probabilistic structure
+    
+    Nodes are stored as a structure of arrays: slot i holds keys[i], and
+    forward[level][i] is the slot index of its successor on that level (NIL
+    for none). Slot 0 is the header. Links are int32 arrays, so a traversal
+    hop is an index lookup rather than an attribute access on a node object.
+    """
     
     def __init__(self, max_level: int = 16, p: float = 0.5):
         self.max_level = max_level
         self.p = p
         self.level = 0
-        self.header = SkipListNode(None, max_level)
+        self._keys = [None]
+        self._forward = [array('i', [NIL]) for _ in range(max_level + 1)]
+        self._capacity = 1
+        self._used = 1
+        self._free = []  # Slots released by delete, reused by insert
+        # Level-0 snapshot for search_fast, rebuilt lazily after writes
+        self._cached_keys = None
+        self.length = 0
+    
+    def __len__(self) -> int:
+        return self.length
     
     def _random_level(self) -> int:
         """Generate random level for a new node"""
+        if self.p == 0.5:
+            # Each bit is a fair coin flip, so the count of trailing zero bits
+            # is geometric with p = 0.5; one PRNG call covers every level
+            bits = random.getrandbits(self.max_level)
+            if not bits:
+                return self.max_level
+            return (bits & -bits).bit_length() - 1
+        
         level = 0
         while random.random() < self.p and level < self.max_level:
             level += 1
         return level
     
-    def insert(self, key: Any) -> None:
-        """Insert a key into the Skip List"""
-        update = [None] * (self.max_level + 1)
-        current = self.header
+    def _allocate(self, key: Any) -> int:
+        """Return a free slot holding key, doubling the arrays when full"""
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+            return slot
+        
+        if self._used == self._capacity:
+            grow = self._capacity
+            self._keys.extend([None] * grow)
+            padding = array('i', [NIL]) * grow
+            for links in self._forward:
+                links.extend(padding)
+            self._capacity += grow
+        
+        slot = self._used
+        self._used += 1
+        self._keys[slot] = key
+        return slot
+    
+    def _find_predecessors(self, key: Any) -> List[int]:
+        """Slot of the last node before key on every level"""
+        keys = self._keys
+        forward = self._forward
+        update = [0] * (self.max_level + 1)
+        current = 0
         
-        # Find position to insert
         for i in range(self.level, -1, -1):
-            while current.forward[i] and current.forward[i].key < key:
-                current = current.forward[i]
+            links = forward[i]
+            nxt = links[current]
+            while nxt != NIL and keys[nxt] < key:
+                current = nxt
+                nxt = links[current]
             update[i] = current
         
-        current = current.forward[0]
+        return update
+    
+    def insert(self, key: Any) -> None:
+        """Insert a key into the Skip List"""
+        # Find position to insert
+        update = self._find_predecessors(key)
+        current = self._forward[0][update[0]]
         
         # If key already exists, update it
-        if current and current.key == key:
-            current.key = key
+        if current != NIL and self._keys[current] == key:
+            self._keys[current] = key
             return
         
-        # Generate random level for new node
+        # Generate random level for new node; levels above the current
+        # height already have the header (slot 0) as predecessor
         new_level = self._random_level()
-        
-        # Update max level if necessary
         if new_level > self.level:
-            for i in range(self.level + 1, new_level + 1):
-                update[i] = self.header
             self.level = new_level
         
         # Create new node
-        new_node = SkipListNode(key, new_level)
+        slot = self._allocate(key)
+        self._cached_keys = None
+        self.length += 1
         
-        # Update forward pointers
+        # Update forward links
         for i in range(new_level + 1):
-            new_node.forward[i] = update[i].forward[i]
-            update[i].forward[i] = new_node
+            links = self._forward[i]
+            links[slot] = links[update[i]]
+            links[update[i]] = slot
+    
+    def insert_many(self, keys) -> None:
+        """Insert many keys at once; an empty list is linked in one sorted pass"""
+        if self.length:
+            for key in keys:
+                self.insert(key)
+            return
+        
+        # Every level is appended to in key order, so each new node's
+        # predecessor on a level is simply the last node placed there
+        tails = [0] * (self.max_level + 1)
+        previous = None
+        for key in sorted(keys):
+            if previous is not None and key == previous:
+                continue
+            previous = key
+            
+            new_level = self._random_level()
+            if new_level > self.level:
+                self.level = new_level
+            slot = self._allocate(key)
+            for i in range(new_level + 1):
+                self._forward[i][tails[i]] = slot
+                tails[i] = slot
+            self.length += 1
+        self._cached_keys = None
     
-    def search(self, key: Any) -> Optional[SkipListNode]:
-        """Search for a key in the Skip List"""
-        current = self.header
+    def search(self, key: Any) -> Optional[Any]:
+        """Search for a key in the Skip List; returns the stored key or None"""
+        keys = self._keys
+        current = 0
         
         for i in range(self.level, -1, -1):
-            while current.forward[i] and current.forward[i].key < key:
-                current = current.forward[i]
+            links = self._forward[i]
+            nxt = links[current]
+            while nxt != NIL and keys[nxt] < key:
+                current = nxt
+                nxt = links[current]
+        
+        current = self._forward[0][current]
+        
+        if current != NIL and keys[current] == key:
+            return keys[current]
+        return None
+    
+    def search_fast(self, key: Any) -> Optional[Any]:
+        """Search via bisect on a cached copy of the level-0 keys
         
-        current = current.forward[0]
+        Intended for read-heavy use: the first call after an insert or delete
+        rebuilds the cache in O(n), later calls are a single C-level bisect.
+        """
+        if self._cached_keys is None:
+            self._cached_keys = self.to_list()
         
-        if current and current.key == key:
-            return current
+        i = bisect.bisect_left(self._cached_keys, key)
+        if i < len(self._cached_keys) and self._cached_keys[i] == key:
+            return self._cached_keys[i]
         return None
     
     def delete(self, key: Any) -> bool:
         """Delete a key from the Skip List"""
-        update = [None] * (self.max_level + 1)
-        current = self.header
-        
         # Find position to delete
-        for i in range(self.level, -1, -1):
-            while current.forward[i] and current.forward[i].key < key:
-                current = current.forward[i]
-            update[i] = current
-        
-        current = current.forward[0]
+        update = self._find_predecessors(key)
+        current = self._forward[0][update[0]]
         
         # If key not found
-        if not current or current.key != key:
+        if current == NIL or self._keys[current] != key:
             return False
         
-        # Update forward pointers
+        self._cached_keys = None
+        
+        # Update forward links
         for i in range(self.level + 1):
-            if update[i].forward[i] != current:
+            links = self._forward[i]
+            if links[update[i]] != current:
                 break
-            update[i].forward[i] = current.forward[i]
+            links[update[i]] = links[current]
+            links[current] = NIL
+        
+        self._keys[current] = None
+        self._free.append(current)
+        self.length -= 1
         
         # Update max level
-        while self.level > 0 and self.header.forward[self.level] is None:
+        while self.level > 0 and self._forward[self.level][0] == NIL:
             self.level -= 1
         
         return True
     
     def to_list(self) -> List[Any]:
         """Convert Skip List to sorted list"""
+        keys = self._keys
+        links = self._forward[0]
         result = []
-        current = self.header.forward[0]
-        while current:
-            result.append(current.key)
-            current = current.forward[0]
+        append = result.append
+        current = links[0]
+        while current != NIL:
+            append(keys[current])
+            current = links[current]
         return result
+    
+    def to_numpy(self, dtype=np.int64) -> np.ndarray:
+        """Sorted keys as a NumPy array, sized up front from the tracked length
+        
+        dtype must hold the keys; keys_dtype() picks one for arbitrary data.
+        """
+        keys = self._keys
+        links = self._forward[0]
+        
+        def walk():
+            current = links[0]
+            while current != NIL:
+                yield keys[current]
+                current = links[current]
+        
+        return np.fromiter(walk(), dtype=dtype, count=self.length)
+
+TRIE_LIST_FANOUT = 8  # Above this many children a node switches to a dict
 
 class TrieNode:
-    """Node class for Trie"""
+    """Node class for Trie
+    
+    children is None for a leaf, a sorted list of (char, child) pairs while
+    the fanout is at most TRIE_LIST_FANOUT, and a TrieChildren dict beyond.
+    """
+    __slots__ = ('children', 'is_end_of_word', 'frequency', 'max_freq')
     
     def __init__(self):
-        self.children = {}
+        # Leaves never get a children container
+        self.children = None
         self.is_end_of_word = False
         self.frequency = 0
+        # Highest word frequency anywhere in this subtree
+        self.max_freq = 0
+    
+    def get_child(self, char: str) -> Optional['TrieNode']:
+        """Child reached by char, or None"""
+        children = self.children
+        if children is None:
+            return None
+        if type(children) is list:
+            # (char,) sorts just before (char, child), so no nodes are compared
+            i = bisect.bisect_left(children, (char,))
+            if i < len(children) and children[i][0] == char:
+                return children[i][1]
+            return None
+        return children.get(char)
+    
+    def get_or_add_child(self, char: str) -> 'TrieNode':
+        """Child reached by char, created if missing"""
+        children = self.children
+        if children is None:
+            child = TrieNode()
+            self.children = [(char, child)]
+            return child
+        if type(children) is list:
+            i = bisect.bisect_left(children, (char,))
+            if i < len(children) and children[i][0] == char:
+                return children[i][1]
+            if len(children) < TRIE_LIST_FANOUT:
+                child = TrieNode()
+                children.insert(i, (char, child))
+                return child
+            children = self.children = TrieChildren(children)
+        # One lookup both finds and, via __missing__, creates the child
+        return children[char]
+    
+    def child_items(self):
+        """(char, child) pairs of this node"""
+        children = self.children
+        if children is None:
+            return ()
+        if type(children) is list:
+            return children
+        return children.items()
+
+class TrieChildren(dict):
+    """Child map that creates the missing child on lookup, for insert only"""
+    __slots__ = ()
+    
+    def __missing__(self, char: str) -> TrieNode:
+        child = self[char] = TrieNode()
+        return child
+
+class TrieArena:
+    """Read-only Trie packed into flat arrays in BFS order
+    
+    Node 0 is the root. The children of node i occupy the contiguous slots
+    first_child[i] .. first_child[i] + child_count[i], sorted by character,
+    and labels[j] is the character leading into node j, so a child lookup is
+    one str.find over that range. frequency is 0 for non-word nodes.
+    """
+    __slots__ = ('labels', 'first_child', 'child_count', 'frequency', 'max_freq')
+    
+    def __init__(self, root: TrieNode):
+        labels = ['\0']  # Placeholder for the root, which no edge leads into
+        first_child = array('i')
+        child_count = array('i')
+        frequency = array('I')
+        max_freq = array('I')
+        
+        nodes = [root]
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            i += 1
+            first_child.append(len(nodes))
+            if node.children:
+                children = sorted(node.child_items(), key=lambda item: item[0])
+                child_count.append(len(children))
+                for char, child in children:
+                    labels.append(char)
+                    nodes.append(child)
+            else:
+                child_count.append(0)
+            frequency.append(node.frequency if node.is_end_of_word else 0)
+            max_freq.append(node.max_freq)
+        
+        self.labels = ''.join(labels)
+        self.first_child = first_child
+        self.child_count = child_count
+        self.frequency = frequency
+        self.max_freq = max_freq
+    
+    def find(self, word: str) -> int:
+        """Index of the node reached by word, or -1"""
+        labels = self.labels
+        first_child = self.first_child
+        child_count = self.child_count
+        i = 0
+        for char in word:
+            first = first_child[i]
+            i = labels.find(char, first, first + child_count[i])
+            if i < 0:
+                return -1
+        return i
+    
+    def top_words(self, i: int, prefix: str, k: int) -> List[str]:
+        """Top-k words by frequency below node i, pruning on max_freq"""
+        labels = self.labels
+        frequency = self.frequency
+        max_freq = self.max_freq
+        heap = []  # min-heap of (frequency, -discovery order, word)
+        order = 0
+        stack = [(i, prefix)]
+        while stack:
+            i, word = stack.pop()
+            if len(heap) == k and max_freq[i] <= heap[0][0]:
+                continue
+            
+            freq = frequency[i]
+            if freq:
+                if len(heap) < k:
+                    heapq.heappush(heap, (freq, -order, word))
+                elif freq > heap[0][0]:
+                    heapq.heapreplace(heap, (freq, -order, word))
+                order += 1
+            
+            first = self.first_child[i]
+            children = range(first, first + self.child_count[i])
+            for j in sorted(children, key=max_freq.__getitem__):
+                stack.append((j, word + labels[j]))
+        
+        return [word for _, _, word in heapq.nlargest(k, heap)]
 
 class Trie:
     """Trie data structure for efficient string operations"""
     
     def __init__(self):
         self.root = TrieNode()
+        self._marisa = None
+        self._arena = None
+    
+    def freeze(self) -> None:
+        """Build a compact read-only copy for search/autocomplete
+        
+        Uses a marisa RecordTrie when marisa-trie is installed and a
+        TrieArena otherwise. The node trie stays the source of truth; any
+        later insert thaws it.
+        """
+        if not MARISA_AVAILABLE:
+            self._arena = TrieArena(self.root)
+            return
+        words = []
+        self._collect_words(self.root, "", words, float('inf'))
+        self._marisa = marisa_trie.RecordTrie('<I', [(word, (freq,)) for word, freq in words])
     
     def insert(self, word: str) -> None:
         """Insert a word into the Trie"""
+        self._marisa = None
+        self._arena = None
         node = self.root
+        path = [node]
         for char in word:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
+            node = node.get_or_add_child(char)
+            path.append(node)
         node.is_end_of_word = True
         node.frequency += 1
+        
+        frequency = node.frequency
+        for node in path:
+            if node.max_freq < frequency:
+                node.max_freq = frequency
+    
+    def insert_many(self, words) -> None:
+        """Insert many words, sorted so each one reuses the previous word's path"""
+        self._marisa = None
+        self._arena = None
+        path = [self.root]
+        previous = ""
+        for word in sorted(words):
+            # Nodes for the prefix shared with the previous word are on path
+            common = 0
+            limit = min(len(previous), len(word))
+            while common < limit and previous[common] == word[common]:
+                common += 1
+            del path[common + 1:]
+            
+            node = path[-1]
+            for char in word[common:]:
+                node = node.get_or_add_child(char)
+                path.append(node)
+            node.is_end_of_word = True
+            node.frequency += 1
+            
+            frequency = node.frequency
+            for node in path:
+                if node.max_freq < frequency:
+                    node.max_freq = frequency
+            previous = word
     
     def search(self, word: str) -> bool:
         """Search for a word in the Trie"""
+        if self._marisa is not None:
+            return word in self._marisa
+        if self._arena is not None:
+            i = self._arena.find(word)
+            return i >= 0 and self._arena.frequency[i] > 0
         node = self._search_node(word)
         return node is not None and node.is_end_of_word
     
     def starts_with(self, prefix: str) -> bool:
         """Check if any word starts with the given prefix"""
+        if self._marisa is not None:
+            return not prefix or next(self._marisa.iterkeys(prefix), None) is not None
+        if self._arena is not None:
+            return self._arena.find(prefix) >= 0
         return self._search_node(prefix) is not None
     
     def _search_node(self, word: str) -> Optional[TrieNode]:
         """Search for a node corresponding to the word"""
         node = self.root
         for char in word:
-            if char not in node.children:
+            node = node.get_child(char)
+            if node is None:
                 return None
-            node = node.children[char]
         return node
     
     def autocomplete(self, prefix: str, max_suggestions: int = 10) -> List[str]:
         """Get autocomplete suggestions for a prefix"""
-        suggestions = []
-        node = self._search_node(prefix)
+        if self._marisa is not None:
+            # Keys and frequencies under the prefix come back in one C call
+            top = heapq.nlargest(max_suggestions, self._marisa.items(prefix), key=lambda item: item[1][0])
+            return [word for word, _ in top]
+        if self._arena is not None:
+            i = self._arena.find(prefix)
+            if i < 0 or max_suggestions <= 0:
+                return []
+            return self._arena.top_words(i, prefix, max_suggestions)
         
-        if node:
-            self._collect_words(node, prefix, suggestions, max_suggestions)
+        node = self._search_node(prefix)
+        if node is None or max_suggestions <= 0:
+            return []
+        return self._top_words(node, prefix, max_suggestions)
+    
+    def _top_words(self, node: TrieNode, prefix: str, k: int) -> List[str]:
+        """Top-k words by frequency below node, pruning on subtree max_freq"""
+        heap = []  # min-heap of (frequency, -discovery order, word)
+        order = 0
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            # Nothing below can displace the current k-th best
+            if len(heap) == k and node.max_freq <= heap[0][0]:
+                continue
+            
+            if node.is_end_of_word:
+                if len(heap) < k:
+                    heapq.heappush(heap, (node.frequency, -order, word))
+                elif node.frequency > heap[0][0]:
+                    heapq.heapreplace(heap, (node.frequency, -order, word))
+                order += 1
+            
+            if node.children:
+                # Push the weakest child first so the strongest is explored next
+                for char, child in sorted(node.child_items(), key=lambda item: item[1].max_freq):
+                    stack.append((child, word + char))
         
-        # Sort by frequency (most frequent first)
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-        return [word for word, freq in suggestions[:max_suggestions]]
+        return [word for _, _, word in heapq.nlargest(k, heap)]
     
     def _collect_words(self, node: TrieNode, prefix: str, suggestions: List[Tuple[str, int]], max_count: int) -> None:
-        """Collect words from a node"""
+        """Collect words from a node (iterative DFS over a shared prefix buffer)"""
         if len(suggestions) >= max_count:
             return
         
         if node.is_end_of_word:
             suggestions.append((prefix, node.frequency))
         
-        for char, child in node.children.items():
-            self._collect_words(child, prefix + char, suggestions, max_count)
+        if node.children is None:
+            return
+        
+        # buf holds the characters of the path below node; each stack entry is
+        # the child iterator of a node on that path
+        buf = list(prefix)
+        stack = [iter(node.child_items())]
+        while stack and len(suggestions) < max_count:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                if stack:
+                    buf.pop()
+                continue
+            
+            char, child = entry
+            buf.append(char)
+            if child.is_end_of_word:
+                suggestions.append((''.join(buf), child.frequency))
+            if child.children:
+                stack.append(iter(child.child_items()))
+            else:
+                buf.pop()
     
     def get_all_words(self) -> List[str]:
         """Get all words in the Trie"""
@@ -412,70 +913,135 @@ class Trie:
         self._collect_words(self.root, "", words, float('inf'))
         return [word for word, freq in words]
 
+@njit(cache=True, nogil=True)
+def _find_halve(parent, x):
+    """Root of x by path halving: every other node on the path is pointed at
+    its grandparent, and the walk jumps straight there"""
+    while parent[x] >= 0:
+        grandparent = parent[parent[x]]
+        if grandparent < 0:
+            # parent[x] is the root
+            return parent[x]
+        parent[x] = grandparent
+        x = grandparent
+    return x
+
+@njit(cache=True, nogil=True)
+def _union(parent, x, y):
+    """Union by size of the sets holding indices x and y
+    
+    Returns the new root, or -1 if x and y were already in the same set.
+    """
+    root_x = _find_halve(parent, x)
+    root_y = _find_halve(parent, y)
+    
+    if root_x == root_y:
+        return -1
+    
+    # Roots store -size, so the more negative entry is the larger set
+    if parent[root_x] > parent[root_y]:
+        root_x, root_y = root_y, root_x
+    
+    parent[root_x] += parent[root_y]
+    parent[root_y] = root_x
+    return root_x
+
+@njit(cache=True, nogil=True)
+def _all_roots(parent, n):
+    """Root index of each of the first n elements"""
+    roots = np.empty(n, dtype=np.int32)
+    for i in range(n):
+        roots[i] = _find_halve(parent, i)
+    return roots
+
 class DisjointSet:
-    """Disjoint Set (Union-Find) data structure"""
+    """Disjoint Set (Union-Find) data structure
+    
+    Elements are mapped to dense indices into a single int32 NumPy array,
+    grown by doubling: a non-root holds its parent's index and a root holds
+    the negated size of its set.
+    """
     
     def __init__(self):
-        self.parent = {}
-        self.rank = {}
-        self.size = {}
+        self.index = {}
+        self.elements = []
+        self.parent = np.empty(0, dtype=np.int32)
+        self._num_sets = 0
+        # get_sets result, dropped whenever the partition changes
+        self._sets_cache = None
+    
+    def _grow(self) -> None:
+        """Double the capacity of the parent array"""
+        n = len(self.elements)
+        parent = np.empty(max(8, 2 * len(self.parent)), dtype=np.int32)
+        parent[:n] = self.parent[:n]
+        self.parent = parent
     
     def make_set(self, x: Any) -> None:
         """Create a new set containing element x"""
-        if x not in self.parent:
-            self.parent[x] = x
-            self.rank[x] = 0
-            self.size[x] = 1
+        if x not in self.index:
+            i = len(self.elements)
+            if i == len(self.parent):
+                self._grow()
+            self.index[x] = i
+            self.elements.append(x)
+            self.parent[i] = -1
+            self._num_sets += 1
+            self._sets_cache = None
+    
+    def _find_root(self, i: int) -> int:
+        """Root index of i, halving the path as it goes"""
+        return _find_halve(self.parent, i)
     
     def find(self, x: Any) -> Any:
         """Find the representative of the set containing x"""
-        if x not in self.parent:
+        if x not in self.index:
             return None
-        
-        # Path compression
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        return self.elements[self._find_root(self.index[x])]
     
     def union(self, x: Any, y: Any) -> None:
         """Union the sets containing x and y"""
-        root_x = self.find(x)
-        root_y = self.find(y)
-        
-        if root_x is None or root_y is None:
+        if x not in self.index or y not in self.index:
             return
         
-        if root_x == root_y:
-            return
-        
-        # Union by rank
-        if self.rank[root_x] < self.rank[root_y]:
-            root_x, root_y = root_y, root_x
-        
-        self.parent[root_y] = root_x
-        self.size[root_x] += self.size[root_y]
-        
-        if self.rank[root_x] == self.rank[root_y]:
-            self.rank[root_x] += 1
+        if _union(self.parent, self.index[x], self.index[y]) >= 0:
+            self._num_sets -= 1
+            self._sets_cache = None
     
     def get_set_size(self, x: Any) -> int:
         """Get the size of the set containing x"""
-        root = self.find(x)
-        return self.size.get(root, 0) if root else 0
+        if x not in self.index:
+            return 0
+        return int(-self.parent[self._find_root(self.index[x])])
     
     def get_sets(self) -> Dict[Any, List[Any]]:
         """Get all sets as a dictionary mapping representatives to elements"""
-        sets = {}
-        for element in self.parent:
-            root = self.find(element)
-            if root not in sets:
-                sets[root] = []
-            sets[root].append(element)
-        return sets
+        if self._sets_cache is None:
+            self._sets_cache = self._group_sets()
+        # Copies so callers cannot corrupt the cache
+        return {root: members[:] for root, members in self._sets_cache.items()}
+    
+    def _group_sets(self) -> Dict[Any, List[Any]]:
+        """Group every element under its representative"""
+        elements = self.elements
+        if not elements:
+            return {}
+        
+        # Sort indices by root so each set is one contiguous run; the stable
+        # sort keeps members in insertion order within their run
+        roots = _all_roots(self.parent, len(elements))
+        order = np.argsort(roots, kind='stable')
+        sorted_roots = roots[order]
+        starts = np.flatnonzero(np.diff(sorted_roots)) + 1
+        
+        return {
+            elements[group_roots[0]]: [elements[i] for i in group.tolist()]
+            for group, group_roots in zip(np.split(order, starts), np.split(sorted_roots, starts))
+        }
     
     def count_sets(self) -> int:
         """Count the number of disjoint sets"""
-        return len(set(self.find(x) for x in self.parent))
+        return self._num_sets
 
 # Example usage and testing
 def test_enhanced_structures():
@@ -3,9 +3,11 @@
 Enhanced Algorithm Visualizer with ML Integration and Performance Analytics
 """
 
+import sys
 import time
-import psutil
 import threading
+import heapq
+from itertools import islice
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -23,7 +25,25 @@ import dash
 from dash import dcc, html, Input, Output, State
 import dash_bootstrap_components as dbc
 
-from enhanced_structures import RedBlackTree, BTree, SkipList, Trie, DisjointSet
+try:
+    # Optional: run the trained forest through ONNX Runtime instead of sklearn
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    import onnxruntime
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+try:
+    import resource
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    _MAXRSS_PER_MB = 1024 * 1024 if sys.platform == 'darwin' else 1024
+except ImportError:
+    # No resource module on Windows; psutil reports the peak working set there
+    resource = None
+    import psutil
+
+from enhanced_structures import RedBlackTree, BTree, SkipList, Trie, DisjointSet, keys_dtype
 from enhanced_algorithms import AlgorithmComparator, PerformanceAnalyzer
 
 # Configure logging
@@ -50,21 +70,31 @@ class MLAlgorithmOptimizer:
         self.scaler = StandardScaler()
         self.is_trained = False
         self.performance_history = []
+        self._session = None  # ONNX Runtime session for the trained model
     
     def extract_features(self, data: List[Any]) -> np.ndarray:
         """Extract features from input data for ML model"""
-        features = []
-        for item in data:
-            if isinstance(item, (int, float)):
-                features.extend([item, abs(item), item ** 2])
-            elif isinstance(item, str):
-                features.extend([len(item), sum(ord(c) for c in item), len(set(item))])
-            else:
-                features.extend([0, 0, 0])  # Default for unknown types
-        
-        # Pad or truncate to fixed length
-        feature_vector = features[:30] + [0] * max(0, 30 - len(features))
-        return np.array(feature_vector).reshape(1, -1)
+        # Three features per item in 30 slots: only the first 10 items count
+        head = list(islice(data, 10))
+        n = len(head)
+        features = np.zeros(30, dtype=np.float64)
+        
+        if all(isinstance(item, (int, float)) for item in head):
+            arr = np.array(head, dtype=np.float64)
+            features[0:3 * n:3] = arr
+            features[1:3 * n:3] = np.abs(arr)
+            features[2:3 * n:3] = arr * arr
+        else:
+            for i, item in enumerate(head):
+                if isinstance(item, (int, float)):
+                    features[3 * i:3 * i + 3] = (item, abs(item), item * item)
+                elif isinstance(item, str):
+                    # UTF-32 code units are exactly the ord() of each character
+                    codes = np.frombuffer(item.encode('utf-32-le'), dtype=np.uint32)
+                    features[3 * i:3 * i + 3] = (len(item), codes.sum(), len(set(item)))
+                # Unknown types keep the zero default
+        
+        return features.reshape(1, -1)
     
     def train(self, training_data: List[Dict]):
         """Train the ML model on historical performance data"""
@@ -88,18 +118,43 @@ class MLAlgorithmOptimizer:
         
         # Train model
         self.model.fit(X_scaled, y)
+        # Kept so prediction can scale inline instead of via scaler.transform
+        self._mean = self.scaler.mean_
+        self._scale = self.scaler.scale_
+        self._session = self._compile_onnx(X.shape[1])
         self.is_trained = True
         logger.info("ML model trained successfully")
     
+    def _compile_onnx(self, n_features: int):
+        """Export the fitted model to an ONNX Runtime session, if available"""
+        if not ONNX_AVAILABLE:
+            return None
+        try:
+            onx = convert_sklearn(self.model, initial_types=[('X', FloatTensorType([None, n_features]))])
+            return onnxruntime.InferenceSession(onx.SerializeToString(), providers=['CPUExecutionProvider'])
+        except Exception as e:
+            logger.warning(f"ONNX export failed, using sklearn for prediction: {e}")
+            return None
+    
     def predict_performance(self, data: List[Any], algorithm: str) -> float:
         """Predict execution time for given data and algorithm"""
         if not self.is_trained:
             return 0.0
         
-        features = self.extract_features(data)
-        features_scaled = self.scaler.transform(features)
-        prediction = self.model.predict(features_scaled)[0]
-        return max(0.0, prediction)
+        return float(self.predict_batch([data])[0])
+    
+    def predict_batch(self, datas: List[List[Any]]) -> np.ndarray:
+        """Predict execution times for several inputs with one model call"""
+        if not self.is_trained:
+            return np.zeros(len(datas))
+        
+        X = np.vstack([self.extract_features(data) for data in datas])
+        X_scaled = (X - self._mean) / self._scale
+        if self._session is not None:
+            predictions = self._session.run(None, {'X': X_scaled.astype(np.float32)})[0].ravel()
+        else:
+            predictions = self.model.predict(X_scaled)
+        return np.maximum(predictions, 0.0)
 
 class DistributedAlgorithmExecutor:
     """Distributed computing support for algorithms"""
@@ -113,6 +168,16 @@ class DistributedAlgorithmExecutor:
         if len(data) < 1000:  # Use sequential for small datasets
             return sorted(data)
         
+        # Numeric data: one C-level sort beats chunked Python sorts under the GIL.
+        # Only all-int or all-float lists qualify; tuples would sort per row
+        # and mixed ints and floats would come back as floats
+        item_types = set(map(type, data))
+        if item_types == {int} or item_types == {float}:
+            arr = np.asarray(data)
+            # Ints beyond int64 come back as an object array
+            if arr.ndim == 1 and arr.dtype.kind in 'iuf':
+                return np.sort(arr).tolist()
+        
         # Split data into chunks
         chunk_size = len(data) // self.max_workers
         chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
@@ -123,7 +188,9 @@ class DistributedAlgorithmExecutor:
             future = self.executor.submit(sorted, chunk)
             futures.append(future)
         
-        # Collect results
+        # Collect results. as_completed yields in completion order, not chunk
+        # order; that is fine because each chunk is sorted independently and
+        # the merge only needs every chunk, not their original sequence
         sorted_chunks = [future.result() for future in as_completed(futures)]
         
         # Merge sorted chunks
@@ -136,27 +203,9 @@ class DistributedAlgorithmExecutor:
         if len(chunks) == 1:
             return chunks[0]
         
-        # Use heap-based merge for efficiency
-        import heapq
-        merged = []
-        heap = []
-        
-        # Initialize heap with first element from each chunk
-        for i, chunk in enumerate(chunks):
-            if chunk:
-                heapq.heappush(heap, (chunk[0], i, 0))
-        
-        # Merge elements
-        while heap:
-            value, chunk_idx, elem_idx = heapq.heappop(heap)
-            merged.append(value)
-            
-            # Add next element from the same chunk if available
-            if elem_idx + 1 < len(chunks[chunk_idx]):
-                next_elem = chunks[chunk_idx][elem_idx + 1]
-                heapq.heappush(heap, (next_elem, chunk_idx, elem_idx + 1))
-        
-        return merged
+        # Numeric input never gets here; parallel_sort sorts it with np.sort.
+        # heapq.merge does the k-way merge in C
+        return list(heapq.merge(*chunks))
 
 class EnhancedVisualizer:
     """Enhanced algorithm visualizer with advanced features"""
@@ -175,26 +224,29 @@ class EnhancedVisualizer:
         self.trie = Trie()
         self.disjoint_set = DisjointSet()
     
+    @staticmethod
+    def _peak_memory_mb() -> float:
+        """Peak resident set size of this process in MB"""
+        if resource is not None:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / _MAXRSS_PER_MB
+        # Windows: peak working set, the counterpart of ru_maxrss
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+    
     def measure_performance(self, func, *args, **kwargs) -> PerformanceMetrics:
         """Measure performance metrics for a function execution"""
-        process = psutil.Process()
-        
-        # Record initial state
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-        initial_cpu = process.cpu_percent()
+        initial_memory = self._peak_memory_mb()
+        initial_cpu = time.process_time_ns()
         
         # Execute function and measure time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        execution_time = time.time() - start_time
+        elapsed_ns = time.perf_counter_ns() - start_time
         
-        # Record final state
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
-        final_cpu = process.cpu_percent()
-        
-        # Calculate metrics
-        memory_usage = final_memory - initial_memory
-        cpu_usage = (initial_cpu + final_cpu) / 2
+        cpu_ns = time.process_time_ns() - initial_cpu
+        memory_usage = self._peak_memory_mb() - initial_memory
+        execution_time = elapsed_ns / 1e9
+        # Share of wall time spent on CPU by this process
+        cpu_usage = 100.0 * cpu_ns / elapsed_ns if elapsed_ns else 0.0
         
         return PerformanceMetrics(
             algorithm_name=func.__name__,
@@ -240,19 +292,17 @@ class EnhancedVisualizer:
             tree.insert(item)
         return tree.inorder_traversal()
     
-    def _test_b_tree(self, data: List[Any]) -> List[Any]:
+    def _test_b_tree(self, data: List[Any]) -> np.ndarray:
         """Test B-Tree operations"""
         tree = BTree(degree=3)
-        for item in data:
-            tree.insert(item)
-        return tree.traverse()
+        tree.insert_many(data)
+        return tree.to_numpy(keys_dtype(data))
     
-    def _test_skip_list(self, data: List[Any]) -> List[Any]:
+    def _test_skip_list(self, data: List[Any]) -> np.ndarray:
         """Test Skip List operations"""
         skip_list = SkipList()
-        for item in data:
-            skip_list.insert(item)
-        return skip_list.to_list()
+        skip_list.insert_many(data)
+        return skip_list.to_numpy(keys_dtype(data))
     
     def generate_performance_report(self, metrics: Dict[str, PerformanceMetrics]) -> str:
         """Generate a comprehensive performance report"""
@@ -273,8 +323,8 @@ class EnhancedVisualizer:
         # ML predictions
         if self.ml_optimizer.is_trained:
             report += "## ML Performance Predictions\n\n"
-            for name, metric in metrics.items():
-                prediction = self.ml_optimizer.predict_performance([metric.input_size], name)
+            predictions = self.ml_optimizer.predict_batch([[metric.input_size] for metric in metrics.values()])
+            for (name, metric), prediction in zip(metrics.items(), predictions):
                 report += f"- **{name}**: Predicted {prediction:.4f}s (Actual: {metric.execution_time:.4f}s)\n"
         
         return report
@@ -10,7 +10,7 @@ import os
 # Add the current directory to the path so we can import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from enhanced_structures import BTree
+from enhanced_structures import BTree, SkipList, keys_dtype
 
 def test_b_tree_performance(data_sizes=[10, 50, 100, 500, 1000]):
     """Test B-tree performance with different data sizes"""
@@ -79,6 +79,34 @@ def test_comparison_with_builtin(data_sizes=[10, 50, 100, 500, 1000]):
         else:
             print("Ratio: Both too fast to measure accurately")
 
+def test_to_numpy_keeps_key_types():
+    """Check to_numpy() with keys_dtype() round-trips non-int keys"""
+    print("\nto_numpy() Key Type Test")
+    print("=" * 40)
+    
+    cases = {
+        'float': [2.5, 0.75, 1.5, 3.25, 0.5] * 20,
+        'str': ["pear", "apple", "fig", "kiwi", "date"] * 20,
+    }
+    
+    for label, test_data in cases.items():
+        tree = BTree(degree=3)
+        tree.insert_many(test_data)
+        skip_list = SkipList()
+        skip_list.insert_many(test_data)
+        
+        checks = {
+            'B-tree': (tree.to_numpy(keys_dtype(test_data)).tolist(), sorted(test_data)),
+            'Skip list': (skip_list.to_numpy(keys_dtype(test_data)).tolist(), sorted(set(test_data))),
+        }
+        for name, (result, expected) in checks.items():
+            if result == expected:
+                print(f"✓ {name} with {label} keys")
+            else:
+                print(f"✗ {name} with {label} keys: CORRUPTED DATA")
+                print(f"  Expected: {expected[:10]}...")
+                print(f"  Got: {result[:10]}...")
+
 if __name__ == "__main__":
     print("Testing B-tree performance improvements...")
     
@@ -88,6 +116,9 @@ if __name__ == "__main__":
     # Test comparison with built-in
     test_comparison_with_builtin()
     
+    # Test non-int keys through to_numpy()
+    test_to_numpy_keeps_key_types()
+    
     print("\n" + "=" * 40)
     print("Performance test completed!")
     print("If all tests pass, the B-tree implementation is working correctly.")
@@ -1,3 +1,3 @@
-from .avl_tree import AVLTree
+from .avl_tree import AVLTree, AVLTreeArray, FrozenAVL
 from .heap import Heap
 from .graph import Graph
@@ -1,16 +1,228 @@
+from collections import deque
+
+import numpy as np
+
+from .log_event import LogEvent
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; without it frozen lookups stay in Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Field names for each logged op, attached when step() hands an entry out
+_LOG_FIELDS = {
+    'rotate_right': ('node', 'new_root'),
+    'rotate_left': ('node', 'new_root'),
+    'insert_start': ('value',),
+    'insert_complete': ('value',),
+    'create_node': ('value',),
+    'traverse_left': ('current', 'target'),
+    'traverse_right': ('current', 'target'),
+    'duplicate_key': ('value',),
+    'check_balance': ('node', 'balance'),
+    'balance_left_left': ('node',),
+    'balance_right_right': ('node',),
+    'balance_left_right': ('node',),
+    'balance_right_left': ('node',),
+    'delete_start': ('value',),
+    'delete_complete': ('value',),
+    'key_not_found': ('value',),
+    'delete_traverse_left': ('current', 'target'),
+    'delete_traverse_right': ('current', 'target'),
+    'delete_node_found': ('value',),
+    'delete_check_balance': ('node', 'balance'),
+    'search_start': ('value',),
+    'search_found': ('value',),
+    'search_not_found': ('value',),
+    'search_traverse_left': ('current', 'target'),
+    'search_traverse_right': ('current', 'target'),
+}
+
+
+@njit(cache=True)
+def _search_many_frozen(keys, left, right, queries):
+    """Slot of each query in a frozen layout, or -1 when absent"""
+    out = np.full(queries.shape[0], -1, dtype=np.int64)
+    for q in range(queries.shape[0]):
+        target = queries[q]
+        i = 0 if keys.shape[0] > 0 else -1
+        while i >= 0:
+            key = keys[i]
+            if target == key:
+                out[q] = i
+                break
+            i = left[i] if target < key else right[i]
+    return out
+
+
+def _subtrees_at_depth(lo, hi, depth, out):
+    """Collect the key ranges rooted `depth` levels below range [lo, hi)"""
+    if lo >= hi:
+        return
+    if depth == 0:
+        out.append((lo, hi))
+        return
+    mid = (lo + hi) // 2
+    _subtrees_at_depth(lo, mid, depth - 1, out)
+    _subtrees_at_depth(mid + 1, hi, depth - 1, out)
+
+
+def _veb_order(lo, hi, height, out):
+    """Append the top `height` levels over [lo, hi) in van Emde Boas order
+
+    The balanced tree over a sorted range roots each subrange at its
+    midpoint. It is cut at half its height: the top half is laid out first,
+    then each bottom subtree in turn, both recursively.
+    """
+    if lo >= hi or height <= 0:
+        return
+    if height == 1:
+        out.append((lo + hi) // 2)
+        return
+    top = height // 2
+    _veb_order(lo, hi, top, out)
+    bottoms = []
+    _subtrees_at_depth(lo, hi, top, bottoms)
+    for sub_lo, sub_hi in bottoms:
+        _veb_order(sub_lo, sub_hi, height - top, out)
+
+
+class FrozenAVL:
+    """Read-only snapshot of an AVLTree's keys in van Emde Boas layout
+
+    Slot i holds keys[i] with children at left[i] / right[i] (-1 for none),
+    and slot 0 is the root. Each recursive block of the tree sits in one
+    contiguous run of the arrays, so a lookup touches O(log_B n) cache lines
+    instead of one per level.
+    """
+
+    def __init__(self, sorted_keys):
+        n = len(sorted_keys)
+        order = []
+        _veb_order(0, n, n.bit_length(), order)
+        slot = {rank: i for i, rank in enumerate(order)}
+
+        left = np.full(n, -1, dtype=np.int32)
+        right = np.full(n, -1, dtype=np.int32)
+        lo_hi = [(0, n)]
+        # Recover each slot's children from the midpoint split of its range
+        while lo_hi:
+            lo, hi = lo_hi.pop()
+            mid = (lo + hi) // 2
+            if lo < mid:
+                left[slot[mid]] = slot[(lo + mid) // 2]
+                lo_hi.append((lo, mid))
+            if mid + 1 < hi:
+                right[slot[mid]] = slot[(mid + 1 + hi) // 2]
+                lo_hi.append((mid + 1, hi))
+
+        key_list = [sorted_keys[rank] for rank in order]
+        keys = np.asarray(key_list)
+        if keys.ndim != 1 or keys.dtype.kind not in 'iuf':
+            # Strings, tuples and other comparables stay as Python objects
+            keys = np.fromiter(key_list, dtype=object, count=n)
+        self.keys = keys
+        self.left = left
+        self.right = right
+        # Python lists for the interpreter walk; indexing numpy arrays
+        # boxes a new scalar on every read
+        self._key_list = key_list
+        self._left_list = left.tolist()
+        self._right_list = right.tolist()
+
+    def __len__(self):
+        return len(self._key_list)
+
+    def __contains__(self, key):
+        return self.search(key) >= 0
+
+    def search(self, key):
+        """Slot holding key, or -1 if it is not in the snapshot"""
+        keys = self._key_list
+        left = self._left_list
+        right = self._right_list
+        i = 0 if keys else -1
+        while i >= 0:
+            node_key = keys[i]
+            if key == node_key:
+                return i
+            i = left[i] if key < node_key else right[i]
+        return -1
+
+    def search_many(self, queries):
+        """search() over a batch of keys, returned as an int64 array of slots"""
+        array = np.asarray(queries)
+        if (NUMBA_AVAILABLE and array.ndim == 1
+                and self.keys.dtype.kind in 'iuf' and array.dtype.kind in 'iuf'):
+            return _search_many_frozen(self.keys, self.left, self.right, array)
+        return np.array([self.search(key) for key in queries], dtype=np.int64)
+
+
 class AVLNode:
+    __slots__ = ('key', 'left', 'right', 'height', 'balance', 'parent')
+
     def __init__(self, key):
         self.key = key
         self.left = None
         self.right = None
         self.height = 1
+        # Left height minus right height, kept current by update_height
+        self.balance = 0
         self.parent = None
 
 class AVLTree:
-    def __init__(self):
+    def __init__(self, trace=False):
         self.root = None
-        self.log = []
+        # Leftmost and rightmost nodes, so min/max queries skip the walk
+        self.min_node = None
+        self.max_node = None
+        self.log = deque()
         self.operation_count = 0
+        # Operation logging is only needed while visualizing
+        self._trace = trace
+
+    @classmethod
+    def from_sorted(cls, keys, trace=False):
+        """Build a balanced tree from strictly increasing keys in O(n)
+
+        Each subrange is rooted at its midpoint, so no rotations are needed.
+        """
+        keys = list(keys)
+        tree = cls(trace=trace)
+
+        def build(lo, hi):
+            if lo > hi:
+                return None
+            mid = (lo + hi) // 2
+            node = AVLNode(keys[mid])
+            node.left = build(lo, mid - 1)
+            node.right = build(mid + 1, hi)
+            if node.left:
+                node.left.parent = node
+            if node.right:
+                node.right.parent = node
+            tree.update_height(node)
+            return node
+
+        tree.root = build(0, len(keys) - 1)
+        tree._refresh_bounds()
+        return tree
+
+    def enable_trace(self):
+        """Start recording operations for visualization"""
+        self._trace = True
+
+    def disable_trace(self):
+        """Stop recording operations"""
+        self._trace = False
 
     def height(self, node):
         if node is None:
@@ -20,11 +232,14 @@ class AVLTree:
     def balance_factor(self, node):
         if node is None:
             return 0
-        return self.height(node.left) - self.height(node.right)
+        return node.balance
 
     def update_height(self, node):
         if node is not None:
-            node.height = max(self.height(node.left), self.height(node.right)) + 1
+            lh = node.left.height if node.left else 0
+            rh = node.right.height if node.right else 0
+            node.height = 1 + (lh if lh > rh else rh)
+            node.balance = lh - rh
 
     def right_rotate(self, y):
         """Right rotation for AVL tree balancing"""
@@ -46,12 +261,8 @@ class AVLTree:
         self.update_height(x)
 
         # Log the rotation
-        self.log.append({
-            'op': 'rotate_right',
-            'node': y.key,
-            'new_root': x.key,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('rotate_right', self.operation_count, y.key, x.key))
         self.operation_count += 1
 
         return x
@@ -76,32 +287,22 @@ class AVLTree:
         self.update_height(y)
 
         # Log the rotation
-        self.log.append({
-            'op': 'rotate_left',
-            'node': x.key,
-            'new_root': y.key,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('rotate_left', self.operation_count, x.key, y.key))
         self.operation_count += 1
 
         return y
 
     def insert(self, key):
         """Insert a new key into the AVL tree"""
-        self.log.append({
-            'op': 'insert_start',
-            'value': key,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('insert_start', self.operation_count, key))
         self.operation_count += 1
 
         self.root = self._insert_recursive(self.root, key)
         
-        self.log.append({
-            'op': 'insert_complete',
-            'value': key,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('insert_complete', self.operation_count, key))
         self.operation_count += 1
 
     def _insert_recursive(self, node, key):
@@ -109,43 +310,33 @@ class AVLTree:
         # Standard BST insert
         if node is None:
             new_node = AVLNode(key)
-            self.log.append({
-                'op': 'create_node',
-                'value': key,
-                'step': self.operation_count
-            })
+            if self.min_node is None or key < self.min_node.key:
+                self.min_node = new_node
+            if self.max_node is None or key > self.max_node.key:
+                self.max_node = new_node
+            if self._trace:
+                self.log.append(LogEvent('create_node', self.operation_count, key))
             self.operation_count += 1
             return new_node
 
         if key < node.key:
-            self.log.append({
-                'op': 'traverse_left',
-                'current': node.key,
-                'target': key,
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(LogEvent('traverse_left', self.operation_count, node.key, key))
             self.operation_count += 1
             node.left = self._insert_recursive(node.left, key)
             if node.left:
                 node.left.parent = node
         elif key > node.key:
-            self.log.append({
-                'op': 'traverse_right',
-                'current': node.key,
-                'target': key,
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(LogEvent('traverse_right', self.operation_count, node.key, key))
             self.operation_count += 1
             node.right = self._insert_recursive(node.right, key)
             if node.right:
                 node.right.parent = node
         else:
             # Duplicate key - log but don't insert
-            self.log.append({
-                'op': 'duplicate_key',
-                'value': key,
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(LogEvent('duplicate_key', self.operation_count, key))
             self.operation_count += 1
             return node
 
@@ -153,171 +344,187 @@ class AVLTree:
         self.update_height(node)
 
         # Get balance factor
-        balance = self.balance_factor(node)
+        balance = node.balance
 
         # Log balance check
-        self.log.append({
-            'op': 'check_balance',
-            'node': node.key,
-            'balance': balance,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('check_balance', self.operation_count, node.key, balance))
         self.operation_count += 1
 
-        # Left Left Case
-        if balance > 1 and key < node.left.key:
-            self.log.append({
-                'op': 'balance_left_left',
-                'node': node.key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            return self.right_rotate(node)
-
-        # Right Right Case
-        if balance < -1 and key > node.right.key:
-            self.log.append({
-                'op': 'balance_right_right',
-                'node': node.key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            return self.left_rotate(node)
-
-        # Left Right Case
-        if balance > 1 and key > node.left.key:
-            self.log.append({
-                'op': 'balance_left_right',
-                'node': node.key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            node.left = self.left_rotate(node.left)
-            return self.right_rotate(node)
-
-        # Right Left Case
-        if balance < -1 and key < node.right.key:
-            self.log.append({
-                'op': 'balance_right_left',
-                'node': node.key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            node.right = self.right_rotate(node.right)
-            return self.left_rotate(node)
+        if balance > 1:
+            left_key = node.left.key
+
+            # Left Left Case
+            if key < left_key:
+                if self._trace:
+                    self.log.append(LogEvent('balance_left_left', self.operation_count, node.key))
+                self.operation_count += 1
+                return self.right_rotate(node)
+
+            # Left Right Case
+            if key > left_key:
+                if self._trace:
+                    self.log.append(LogEvent('balance_left_right', self.operation_count, node.key))
+                self.operation_count += 1
+                node.left = self.left_rotate(node.left)
+                return self.right_rotate(node)
+
+        elif balance < -1:
+            right_key = node.right.key
+
+            # Right Right Case
+            if key > right_key:
+                if self._trace:
+                    self.log.append(LogEvent('balance_right_right', self.operation_count, node.key))
+                self.operation_count += 1
+                return self.left_rotate(node)
+
+            # Right Left Case
+            if key < right_key:
+                if self._trace:
+                    self.log.append(LogEvent('balance_right_left', self.operation_count, node.key))
+                self.operation_count += 1
+                node.right = self.right_rotate(node.right)
+                return self.left_rotate(node)
 
         return node
 
     def delete(self, key):
         """Delete a key from the AVL tree"""
-        self.log.append({
-            'op': 'delete_start',
-            'value': key,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('delete_start', self.operation_count, key))
         self.operation_count += 1
 
-        self.root = self._delete_recursive(self.root, key)
+        self._delete_iterative(key)
         
-        self.log.append({
-            'op': 'delete_complete',
-            'value': key,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('delete_complete', self.operation_count, key))
         self.operation_count += 1
 
-    def _delete_recursive(self, node, key):
-        """Recursive helper for delete operation"""
-        if node is None:
-            self.log.append({
-                'op': 'key_not_found',
-                'value': key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            return node
+    def _delete_iterative(self, key):
+        """Iterative helper for delete operation
 
-        if key < node.key:
-            self.log.append({
-                'op': 'delete_traverse_left',
-                'current': node.key,
-                'target': key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            node.left = self._delete_recursive(node.left, key)
-        elif key > node.key:
-            self.log.append({
-                'op': 'delete_traverse_right',
-                'current': node.key,
-                'target': key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            node.right = self._delete_recursive(node.right, key)
-        else:
-            # Node to be deleted found
-            self.log.append({
-                'op': 'delete_node_found',
-                'value': key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
+        Descends once recording the path, then rebalances bottom-up along it.
+        """
+        path = []  # (ancestor, went_left) pairs from the root down
+        node = self.root
+        unlinked_bound = False
+        # The descent counts in a local; rotations below use the attribute
+        trace = self._trace
+        ops = self.operation_count
 
-            # Node with only one child or no child
-            if node.left is None:
-                temp = node.right
-                if temp:
-                    temp.parent = node.parent
-                return temp
-            elif node.right is None:
-                temp = node.left
+        while True:
+            if node is None:
+                if trace:
+                    self.log.append(LogEvent('key_not_found', ops, key))
+                ops += 1
+                break
+
+            if key < node.key:
+                if trace:
+                    self.log.append(LogEvent('delete_traverse_left', ops, node.key, key))
+                ops += 1
+                path.append((node, True))
+                node = node.left
+            elif key > node.key:
+                if trace:
+                    self.log.append(LogEvent('delete_traverse_right', ops, node.key, key))
+                ops += 1
+                path.append((node, False))
+                node = node.right
+            else:
+                # Node to be deleted found
+                if trace:
+                    self.log.append(LogEvent('delete_node_found', ops, key))
+                ops += 1
+
+                if node.left is not None and node.right is not None:
+                    # Node with two children: take the inorder successor's key,
+                    # then carry on down the right subtree to delete the successor
+                    temp = self._get_min_value_node(node.right)
+                    node.key = temp.key
+                    key = temp.key
+                    path.append((node, False))
+                    node = node.right
+                    continue
+
+                # Node with only one child or no child
+                temp = node.right if node.left is None else node.left
                 if temp:
                     temp.parent = node.parent
-                return temp
+                self._replace_child(path, temp)
+                unlinked_bound = node is self.min_node or node is self.max_node
+                break
+        self.operation_count = ops
+
+        # Walk back up, rebalancing each ancestor
+        while path:
+            node, _ = path.pop()
+
+            # Update height
+            self.update_height(node)
+
+            # Get balance factor
+            balance = node.balance
+
+            # Log balance check
+            if self._trace:
+                self.log.append(LogEvent(
+                    'delete_check_balance', self.operation_count,
+                    node.key, balance))
+            self.operation_count += 1
 
-            # Node with two children: get inorder successor
-            temp = self._get_min_value_node(node.right)
-            node.key = temp.key
-            node.right = self._delete_recursive(node.right, temp.key)
+            if balance > 1:
+                left = node.left
 
-        if node is None:
-            return node
+                # Left Right Case
+                if left.balance < 0:
+                    node.left = self.left_rotate(left)
 
-        # Update height
-        self.update_height(node)
+                # Left Left Case (and the second half of Left Right)
+                node = self.right_rotate(node)
 
-        # Get balance factor
-        balance = self.balance_factor(node)
+            elif balance < -1:
+                right = node.right
 
-        # Log balance check
-        self.log.append({
-            'op': 'delete_check_balance',
-            'node': node.key,
-            'balance': balance,
-            'step': self.operation_count
-        })
-        self.operation_count += 1
+                # Right Left Case
+                if right.balance > 0:
+                    node.right = self.right_rotate(right)
 
-        # Left Left Case
-        if balance > 1 and self.balance_factor(node.left) >= 0:
-            return self.right_rotate(node)
+                # Right Right Case (and the second half of Right Left)
+                node = self.left_rotate(node)
 
-        # Left Right Case
-        if balance > 1 and self.balance_factor(node.left) < 0:
-            node.left = self.left_rotate(node.left)
-            return self.right_rotate(node)
+            self._replace_child(path, node)
 
-        # Right Right Case
-        if balance < -1 and self.balance_factor(node.right) <= 0:
-            return self.left_rotate(node)
+        # Only unlinking the cached leftmost/rightmost node needs a re-walk
+        if unlinked_bound:
+            self._refresh_bounds()
 
-        # Right Left Case
-        if balance < -1 and self.balance_factor(node.right) > 0:
-            node.right = self.right_rotate(node.right)
-            return self.left_rotate(node)
+    def _refresh_bounds(self):
+        """Recompute min_node and max_node from the root"""
+        if self.root is None:
+            self.min_node = self.max_node = None
+        else:
+            self.min_node = self._get_min_value_node(self.root)
+            self.max_node = self._get_max_value_node(self.root)
 
-        return node
+    def _replace_child(self, path, node):
+        """Hang node where the last step of path led (or at the root)"""
+        if not path:
+            self.root = node
+        else:
+            parent, went_left = path[-1]
+            if went_left:
+                parent.left = node
+            else:
+                parent.right = node
+
+    def freeze(self):
+        """Snapshot the current keys as a FrozenAVL for read-heavy lookups
+
+        The snapshot does not follow later inserts or deletes.
+        """
+        return FrozenAVL(self.inorder_traversal())
 
     def _get_min_value_node(self, node):
         """Get the node with minimum value in the subtree"""
@@ -326,69 +533,83 @@ class AVLTree:
             current = current.left
         return current
 
+    def _get_max_value_node(self, node):
+        """Get the node with maximum value in the subtree"""
+        current = node
+        while current.right is not None:
+            current = current.right
+        return current
+
+    def get_min(self):
+        """Smallest key in the tree, or None if it is empty"""
+        return self.min_node.key if self.min_node else None
+
+    def get_max(self):
+        """Largest key in the tree, or None if it is empty"""
+        return self.max_node.key if self.max_node else None
+
     def search(self, key):
         """Search for a key in the AVL tree"""
-        self.log.append({
-            'op': 'search_start',
-            'value': key,
-            'step': self.operation_count
-        })
+        if not self._trace:
+            # Tight loop for untraced lookups, counting the steps the traced
+            # path would log: start, one per level walked, and the result
+            node = self.root
+            steps = 2
+            while node is not None:
+                node_key = node.key
+                if key == node_key:
+                    break
+                node = node.left if key < node_key else node.right
+                steps += 1
+            self.operation_count += steps
+            return node
+
+        self.log.append(LogEvent('search_start', self.operation_count, key))
         self.operation_count += 1
 
-        result = self._search_recursive(self.root, key)
+        result = self._search_iterative(key)
         
-        if result:
-            self.log.append({
-                'op': 'search_found',
-                'value': key,
-                'step': self.operation_count
-            })
-        else:
-            self.log.append({
-                'op': 'search_not_found',
-                'value': key,
-                'step': self.operation_count
-            })
+        self.log.append(LogEvent(
+            'search_found' if result else 'search_not_found', self.operation_count,
+            key))
         self.operation_count += 1
 
         return result
 
-    def _search_recursive(self, node, key):
-        """Recursive helper for search operation"""
-        if node is None or node.key == key:
-            return node
-
-        if key < node.key:
-            self.log.append({
-                'op': 'search_traverse_left',
-                'current': node.key,
-                'target': key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            return self._search_recursive(node.left, key)
-        else:
-            self.log.append({
-                'op': 'search_traverse_right',
-                'current': node.key,
-                'target': key,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-            return self._search_recursive(node.right, key)
+    def _search_iterative(self, key):
+        """Iterative helper for search operation"""
+        node = self.root
+        while node is not None and node.key != key:
+            if key < node.key:
+                if self._trace:
+                    self.log.append(LogEvent(
+                        'search_traverse_left', self.operation_count,
+                        node.key, key))
+                self.operation_count += 1
+                node = node.left
+            else:
+                if self._trace:
+                    self.log.append(LogEvent(
+                        'search_traverse_right', self.operation_count,
+                        node.key, key))
+                self.operation_count += 1
+                node = node.right
+        return node
 
     def inorder_traversal(self):
         """Perform inorder traversal of the tree"""
         result = []
-        self._inorder_recursive(self.root, result)
-        return result
-
-    def _inorder_recursive(self, node, result):
-        """Recursive helper for inorder traversal"""
-        if node:
-            self._inorder_recursive(node.left, result)
+        stack = []
+        node = self.root
+        while stack or node:
+            # Go as far left as possible, then visit and turn right
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
             result.append(node.key)
-            self._inorder_recursive(node.right, result)
+            node = node.right
+        return result
 
     def get_tree_structure(self):
         """Get the tree structure for visualization"""
@@ -402,7 +623,7 @@ class AVLTree:
             return {
                 'key': node.key,
                 'height': node.height,
-                'balance': self.balance_factor(node),
+                'balance': node.balance,
                 'left': build_structure(node.left),
                 'right': build_structure(node.right)
             }
@@ -412,13 +633,15 @@ class AVLTree:
     def step(self):
         """Return the next operation for visualization"""
         if self.log:
-            return self.log.pop(0)
+            return self.log.popleft().to_dict(_LOG_FIELDS)
         return None 
 
     def reset(self):
         """Reset the tree and operation log"""
         self.root = None
-        self.log = []
+        self.min_node = None
+        self.max_node = None
+        self.log = deque()
         self.operation_count = 0
 
     def get_statistics(self):
@@ -437,4 +660,247 @@ class AVLTree:
             'total_nodes': count_nodes(self.root),
             'height': get_max_height(self.root),
             'operations_performed': self.operation_count
-        } 
\ No newline at end of file
+        } 
+
+# Deeper than any AVL tree whose node count fits an int32 slot index
+_MAX_DEPTH = 64
+
+
+@njit(cache=True)
+def _slot_height(height, i):
+    return height[i] if i >= 0 else 0
+
+
+@njit(cache=True)
+def _slot_rotate_right(left, right, height, y):
+    x = left[y]
+    left[y] = right[x]
+    right[x] = y
+    height[y] = 1 + max(_slot_height(height, left[y]), _slot_height(height, right[y]))
+    height[x] = 1 + max(_slot_height(height, left[x]), height[y])
+    return x
+
+
+@njit(cache=True)
+def _slot_rotate_left(left, right, height, x):
+    y = right[x]
+    right[x] = left[y]
+    left[y] = x
+    height[x] = 1 + max(_slot_height(height, left[x]), _slot_height(height, right[x]))
+    height[y] = 1 + max(height[x], _slot_height(height, right[y]))
+    return y
+
+
+@njit(cache=True)
+def _slot_rebalance(left, right, height, i):
+    """Refresh slot i's height and rotate if it is out of balance
+
+    Returns the slot now at the top of i's subtree.
+    """
+    lh = _slot_height(height, left[i])
+    rh = _slot_height(height, right[i])
+    height[i] = 1 + max(lh, rh)
+    if lh - rh > 1:
+        child = left[i]
+        if _slot_height(height, left[child]) < _slot_height(height, right[child]):
+            left[i] = _slot_rotate_left(left, right, height, child)
+        return _slot_rotate_right(left, right, height, i)
+    if rh - lh > 1:
+        child = right[i]
+        if _slot_height(height, right[child]) < _slot_height(height, left[child]):
+            right[i] = _slot_rotate_right(left, right, height, child)
+        return _slot_rotate_left(left, right, height, i)
+    return i
+
+
+@njit(cache=True)
+def _slot_retrace(left, right, height, path, depth, root):
+    """Rebalance the recorded path bottom-up; returns the new root"""
+    while depth > 0:
+        depth -= 1
+        i = path[depth]
+        top = _slot_rebalance(left, right, height, i)
+        if depth == 0:
+            root = top
+        else:
+            parent = path[depth - 1]
+            if left[parent] == i:
+                left[parent] = top
+            else:
+                right[parent] = top
+    return root
+
+
+@njit(cache=True)
+def _slot_insert(keys, left, right, height, path, root, slot, key):
+    """Insert key into the free slot; returns (root, inserted)"""
+    depth = 0
+    i = root
+    while i >= 0:
+        path[depth] = i
+        depth += 1
+        if key < keys[i]:
+            i = left[i]
+        elif key > keys[i]:
+            i = right[i]
+        else:
+            return root, False
+
+    keys[slot] = key
+    left[slot] = -1
+    right[slot] = -1
+    height[slot] = 1
+    if depth == 0:
+        return slot, True
+    parent = path[depth - 1]
+    if key < keys[parent]:
+        left[parent] = slot
+    else:
+        right[parent] = slot
+    return _slot_retrace(left, right, height, path, depth, root), True
+
+
+@njit(cache=True)
+def _slot_delete(keys, left, right, height, path, root, key):
+    """Unlink key's node; returns (root, freed slot or -1 if absent)"""
+    depth = 0
+    i = root
+    while i >= 0 and keys[i] != key:
+        path[depth] = i
+        depth += 1
+        i = left[i] if key < keys[i] else right[i]
+    if i < 0:
+        return root, -1
+
+    if left[i] >= 0 and right[i] >= 0:
+        # Move the inorder successor's key up, then unlink the successor
+        path[depth] = i
+        depth += 1
+        target = right[i]
+        while left[target] >= 0:
+            path[depth] = target
+            depth += 1
+            target = left[target]
+        keys[i] = keys[target]
+        i = target
+
+    child = left[i] if left[i] >= 0 else right[i]
+    if depth == 0:
+        return child, i
+    parent = path[depth - 1]
+    if left[parent] == i:
+        left[parent] = child
+    else:
+        right[parent] = child
+    return _slot_retrace(left, right, height, path, depth, root), i
+
+
+@njit(cache=True)
+def _slot_search(keys, left, right, root, key):
+    i = root
+    while i >= 0:
+        if key == keys[i]:
+            return i
+        i = left[i] if key < keys[i] else right[i]
+    return -1
+
+
+@njit(cache=True)
+def _slot_inorder(keys, left, right, root, size):
+    out = np.empty(size, dtype=keys.dtype)
+    stack = np.empty(_MAX_DEPTH, dtype=np.int32)
+    top = 0
+    count = 0
+    i = root
+    while top > 0 or i >= 0:
+        while i >= 0:
+            stack[top] = i
+            top += 1
+            i = left[i]
+        top -= 1
+        i = stack[top]
+        out[count] = keys[i]
+        count += 1
+        i = right[i]
+    return out
+
+
+class AVLTreeArray:
+    """Untraced AVL tree over parallel NumPy arrays
+
+    Node i is keys[i] / left[i] / right[i] / height[i], with -1 for a missing
+    child, so a node costs a few bytes of contiguous storage instead of a
+    Python object. Keys must fit the dtype given at construction. Insert,
+    delete and search run as compiled kernels when Numba is installed.
+    """
+
+    def __init__(self, capacity=16, dtype=np.int64):
+        capacity = max(1, capacity)
+        self.keys = np.empty(capacity, dtype=dtype)
+        self.left = np.empty(capacity, dtype=np.int32)
+        self.right = np.empty(capacity, dtype=np.int32)
+        self.height = np.empty(capacity, dtype=np.int8)
+        self.root = -1
+        self.size = 0
+        # Slots released by delete, reused before growing the arrays
+        self.free = []
+        self._next_slot = 0
+        self._path = np.empty(_MAX_DEPTH, dtype=np.int32)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def _grow(self):
+        """Double the capacity of every array"""
+        n = len(self.keys)
+        for name in ('keys', 'left', 'right', 'height'):
+            old = getattr(self, name)
+            new = np.empty(2 * n, dtype=old.dtype)
+            new[:n] = old
+            setattr(self, name, new)
+
+    def _take_slot(self):
+        if self.free:
+            return self.free.pop()
+        if self._next_slot == len(self.keys):
+            self._grow()
+        self._next_slot += 1
+        return self._next_slot - 1
+
+    def insert(self, key):
+        """Insert key; returns False if it was already present"""
+        slot = self._take_slot()
+        self.root, inserted = _slot_insert(
+            self.keys, self.left, self.right, self.height, self._path,
+            self.root, slot, key)
+        if inserted:
+            self.size += 1
+        else:
+            self.free.append(slot)
+        return inserted
+
+    def delete(self, key):
+        """Delete key; returns False if it was not present"""
+        self.root, slot = _slot_delete(
+            self.keys, self.left, self.right, self.height, self._path,
+            self.root, key)
+        if slot < 0:
+            return False
+        self.free.append(slot)
+        self.size -= 1
+        return True
+
+    def search(self, key):
+        """Whether key is in the tree"""
+        return _slot_search(self.keys, self.left, self.right, self.root, key) >= 0
+
+    def inorder_traversal(self):
+        """Keys in sorted order"""
+        return _slot_inorder(self.keys, self.left, self.right, self.root, self.size).tolist()
+
+    def get_height(self):
+        """Height of the tree (0 when empty)"""
+        return int(self.height[self.root]) if self.root >= 0 else 0
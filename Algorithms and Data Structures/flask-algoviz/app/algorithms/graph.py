@@ -1,245 +1,568 @@
 from collections import deque, defaultdict
+from itertools import count
 import heapq
 
+import numpy as np
+
+from .log_event import LogEvent
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; without it traversals stay on the adjacency lists
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Field names for each logged op, attached when step() hands an entry out
+_LOG_FIELDS = {
+    'add_edge': ('from', 'to', 'weight'),
+    'remove_edge': ('from', 'to'),
+    'add_vertex': ('vertex',),
+    'remove_vertex': ('vertex',),
+    'bfs_start': ('start',),
+    'bfs_visit': ('vertex',),
+    'bfs_discover': ('from', 'to'),
+    'bfs_complete': ('result',),
+    'dfs_start': ('start',),
+    'dfs_visit': ('vertex',),
+    'dfs_discover': ('from', 'to'),
+    'dfs_complete': ('result',),
+    'dijkstra_start': ('start', 'end'),
+    'dijkstra_visit': ('vertex', 'distance'),
+    'dijkstra_relax': ('from', 'to', 'new_distance'),
+    'dijkstra_complete': ('distances',),
+    'shortest_path': ('start', 'end', 'path', 'distance'),
+    'cycle_detection_start': (),
+    'cycle_dfs_visit': ('vertex',),
+    'cycle_found': ('vertex', 'neighbor'),
+    'cycle_detection_complete': ('result',),
+    'topological_sort_start': (),
+    'topological_dfs_visit': ('vertex',),
+    'topological_sort_cycle': (),
+    'topological_sort_complete': ('result',),
+}
+
+
+@njit(cache=True)
+def _bfs_csr(indptr, indices, start):
+    """Vertex indices in BFS discovery order; the output doubles as the queue"""
+    n = indptr.shape[0] - 1
+    seen = np.zeros(n, dtype=np.bool_)
+    order = np.empty(n, dtype=np.int64)
+    seen[start] = True
+    order[0] = start
+    head = 0
+    tail = 1
+    while head < tail:
+        v = order[head]
+        head += 1
+        for e in range(indptr[v], indptr[v + 1]):
+            w = indices[e]
+            if not seen[w]:
+                seen[w] = True
+                order[tail] = w
+                tail += 1
+    return order[:tail]
+
+
+@njit(cache=True)
+def _dfs_csr(indptr, indices, start):
+    """Vertex indices in recursive-DFS preorder, using an explicit edge stack"""
+    n = indptr.shape[0] - 1
+    seen = np.zeros(n, dtype=np.bool_)
+    order = np.empty(n, dtype=np.int64)
+    stack_vertex = np.empty(n, dtype=np.int64)
+    stack_edge = np.empty(n, dtype=np.int64)
+    seen[start] = True
+    order[0] = start
+    count = 1
+    stack_vertex[0] = start
+    stack_edge[0] = indptr[start]
+    top = 1
+    while top > 0:
+        v = stack_vertex[top - 1]
+        e = stack_edge[top - 1]
+        if e == indptr[v + 1]:
+            top -= 1
+            continue
+        stack_edge[top - 1] = e + 1
+        w = indices[e]
+        if not seen[w]:
+            seen[w] = True
+            order[count] = w
+            count += 1
+            stack_vertex[top] = w
+            stack_edge[top] = indptr[w]
+            top += 1
+    return order[:count]
+
+
+@njit(cache=True)
+def _dijkstra_csr(indptr, indices, weights, start, target, zero_one):
+    """Dijkstra over CSR arrays, visiting vertices in Graph.dijkstra's order
+
+    As in Graph.dijkstra, 0/1 weights run 0-1 BFS on a deque (here a ring
+    buffer), and otherwise an array-backed lazy-deletion heap pops equal
+    distances in push order. Visit and relaxation counts and the previous
+    tree therefore match the traced Python path, ties included.
+
+    Returns (distances, previous, visits, relaxations); previous is -1 where
+    unset. Like Graph.dijkstra, the target's edges are relaxed before stopping.
+    """
+    n = indptr.shape[0] - 1
+    distances = np.full(n, np.inf)
+    previous = np.full(n, -1, dtype=np.int64)
+    visited = np.zeros(n, dtype=np.bool_)
+    # Each edge is relaxed at most once, so E + 1 queue slots always suffice
+    capacity = indices.shape[0] + 1
+    queue_keys = np.empty(capacity, dtype=np.float64)
+    queue_ids = np.empty(capacity, dtype=np.int64)
+    queue_order = np.empty(capacity, dtype=np.int64)
+    visits = 0
+    relaxations = 0
+
+    distances[start] = 0.0
+    queue_keys[0] = 0.0
+    queue_ids[0] = start
+    queue_order[0] = 0
+    head = 0  # First deque slot; the heap always starts at 0
+    size = 1
+    pushes = 1
+
+    while size > 0:
+        size -= 1
+        if zero_one:
+            current_distance = queue_keys[head]
+            u = queue_ids[head]
+            head = head + 1 if head + 1 < capacity else 0
+        else:
+            current_distance = queue_keys[0]
+            u = queue_ids[0]
+
+            # Pop: move the last entry to the root and sift it down. Entries
+            # order by distance, then by push order
+            if size > 0:
+                key = queue_keys[size]
+                node = queue_ids[size]
+                order = queue_order[size]
+                i = 0
+                while True:
+                    child = 2 * i + 1
+                    if child >= size:
+                        break
+                    right = child + 1
+                    if right < size and (
+                            queue_keys[right] < queue_keys[child]
+                            or (queue_keys[right] == queue_keys[child]
+                                and queue_order[right] < queue_order[child])):
+                        child = right
+                    if queue_keys[child] > key or (
+                            queue_keys[child] == key and queue_order[child] > order):
+                        break
+                    queue_keys[i] = queue_keys[child]
+                    queue_ids[i] = queue_ids[child]
+                    queue_order[i] = queue_order[child]
+                    i = child
+                queue_keys[i] = key
+                queue_ids[i] = node
+                queue_order[i] = order
+
+        if visited[u]:
+            continue
+        visited[u] = True
+        visits += 1
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            candidate = current_distance + weights[k]
+            if candidate < distances[v]:
+                distances[v] = candidate
+                previous[v] = u
+                relaxations += 1
+
+                if zero_one:
+                    # 0-weight edges go to the front, 1-weight to the back
+                    if weights[k] == 0.0:
+                        head = head - 1 if head > 0 else capacity - 1
+                        i = head
+                    else:
+                        i = head + size
+                        if i >= capacity:
+                            i -= capacity
+                    queue_keys[i] = candidate
+                    queue_ids[i] = v
+                    size += 1
+                else:
+                    # Push: sift the new entry up from the end; it was pushed
+                    # last, so it only passes parents with a larger distance
+                    i = size
+                    size += 1
+                    while i > 0:
+                        parent = (i - 1) // 2
+                        if queue_keys[parent] <= candidate:
+                            break
+                        queue_keys[i] = queue_keys[parent]
+                        queue_ids[i] = queue_ids[parent]
+                        queue_order[i] = queue_order[parent]
+                        i = parent
+                    queue_keys[i] = candidate
+                    queue_ids[i] = v
+                    queue_order[i] = pushes
+                pushes += 1
+
+        if u == target:
+            break
+
+    return distances, previous, visits, relaxations
+
 class Graph:
-    def __init__(self, directed=False):
+    def __init__(self, directed=False, trace=False):
+        # Each adjacency entry is a (neighbor, weight) pair
         self.adj = defaultdict(list)
-        self.weights = {}
+        # rev[v] holds every u with an entry for v in adj[u]
+        self.rev = defaultdict(set)
         self.directed = directed
-        self.log = []
+        self.log = deque()
         self.operation_count = 0
+        # Operation logging is only needed while visualizing
+        self._trace = trace
+        # CSR snapshot built by finalize(), dropped on any mutation
+        self._csr = None
+
+    def enable_trace(self):
+        """Start recording operations for visualization"""
+        self._trace = True
+
+    def disable_trace(self):
+        """Stop recording operations"""
+        self._trace = False
 
     def add_edge(self, u, v, weight=1):
         """Add an edge from u to v with optional weight"""
-        self.adj[u].append(v)
-        self.weights[(u, v)] = weight
+        self.adj[u].append((v, weight))
+        self.rev[v].add(u)
         
         # If undirected, add reverse edge
         if not self.directed:
-            self.adj[v].append(u)
-            self.weights[(v, u)] = weight
-
-        self.log.append({
-            'op': 'add_edge',
-            'from': u,
-            'to': v,
-            'weight': weight,
-            'step': self.operation_count
-        })
+            self.adj[v].append((u, weight))
+            self.rev[u].add(v)
+        self._csr = None
+
+        if self._trace:
+            self.log.append(LogEvent('add_edge', self.operation_count, u, v, weight))
         self.operation_count += 1
 
     def remove_edge(self, u, v):
         """Remove an edge from u to v"""
-        if v in self.adj[u]:
-            self.adj[u].remove(v)
-            if (u, v) in self.weights:
-                del self.weights[(u, v)]
+        if self._remove_neighbor(u, v):
+            self._csr = None
             
-            if not self.directed and u in self.adj[v]:
-                self.adj[v].remove(u)
-                if (v, u) in self.weights:
-                    del self.weights[(v, u)]
-
-            self.log.append({
-                'op': 'remove_edge',
-                'from': u,
-                'to': v,
-                'step': self.operation_count
-            })
+            if not self.directed:
+                self._remove_neighbor(v, u)
+
+            if self._trace:
+                self.log.append(LogEvent('remove_edge', self.operation_count, u, v))
             self.operation_count += 1
 
+    def _remove_neighbor(self, u, v):
+        """Drop the first u -> v entry; return whether one was found"""
+        # .get, so a missing u is not added to the adjacency lists
+        neighbors = self.adj.get(u, ())
+        for i, (neighbor, _) in enumerate(neighbors):
+            if neighbor == v:
+                del neighbors[i]
+                # Keep the reverse entry while a parallel edge remains
+                if all(neighbor != v for neighbor, _ in neighbors[i:]):
+                    self.rev[v].discard(u)
+                return True
+        return False
+
     def add_vertex(self, vertex):
         """Add a vertex to the graph"""
         if vertex not in self.adj:
             self.adj[vertex] = []
-            self.log.append({
-                'op': 'add_vertex',
-                'vertex': vertex,
-                'step': self.operation_count
-            })
+            self._csr = None
+            if self._trace:
+                self.log.append(LogEvent('add_vertex', self.operation_count, vertex))
             self.operation_count += 1
 
     def remove_vertex(self, vertex):
         """Remove a vertex and all its edges"""
         if vertex in self.adj:
-            # Remove all edges to this vertex
-            for u in list(self.adj.keys()):
-                if vertex in self.adj[u]:
-                    self.adj[u].remove(vertex)
-                    if (u, vertex) in self.weights:
-                        del self.weights[(u, vertex)]
+            # Remove all edges to this vertex, visiting only its sources
+            for u in self.rev.pop(vertex, ()):
+                if u != vertex:
+                    self.adj[u] = [edge for edge in self.adj[u] if edge[0] != vertex]
+
+            # Remove the vertex, and itself from its targets' sources
+            for v, _ in self.adj.pop(vertex):
+                if v != vertex:
+                    self.rev[v].discard(vertex)
+            self._csr = None
             
-            # Remove the vertex
-            del self.adj[vertex]
-            
-            self.log.append({
-                'op': 'remove_vertex',
-                'vertex': vertex,
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(LogEvent('remove_vertex', self.operation_count, vertex))
             self.operation_count += 1
 
+    def finalize(self):
+        """Snapshot the adjacency lists as CSR arrays for the compiled kernels
+
+        Vertices get dense indices in adjacency order, followed by any vertex
+        that only appears as an edge target. Edge order within each row
+        matches the adjacency list, so traversal orders are unchanged.
+        """
+        vertices = list(self.adj)
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        for neighbors in list(self.adj.values()):
+            for v, _ in neighbors:
+                if v not in index:
+                    index[v] = len(vertices)
+                    vertices.append(v)
+
+        indptr = np.zeros(len(vertices) + 1, dtype=np.int64)
+        indices = []
+        weights = []
+        for u, neighbors in self.adj.items():
+            indptr[index[u] + 1] = len(neighbors)
+            for v, weight in neighbors:
+                indices.append(index[v])
+                weights.append(weight)
+        np.cumsum(indptr, out=indptr)
+
+        self._csr = {
+            'vertices': vertices,
+            'index': index,
+            'indptr': indptr,
+            'indices': np.array(indices, dtype=np.int64),
+            'weights': np.array(weights, dtype=np.float64),
+            # Report integer distances when every weight is an int
+            'integral': all(isinstance(w, int) for w in weights),
+            # dijkstra() switches to 0-1 BFS on the same condition
+            'zero_one': all(w == 0 or w == 1 for w in weights),
+            # Reading a missing key of the defaultdict adds a vertex without
+            # dropping the snapshot, so remember how many it covered
+            'size': len(self.adj),
+        }
+        return self._csr
+
+    def _fast_path(self, start=None):
+        """CSR snapshot to run a compiled kernel on, or None to walk the lists
+
+        The kernels emit no log entries, so they only run with tracing off.
+        """
+        if self._trace or not NUMBA_AVAILABLE:
+            return None
+        return self._current_csr(start)
+
+    def _current_csr(self, start=None):
+        """CSR snapshot covering every vertex in adj (and start), rebuilt if stale"""
+        csr = self._csr
+        if csr is None or csr['size'] != len(self.adj) or (
+                start is not None and start not in csr['index']):
+            csr = self.finalize()
+        return csr
+
     def bfs(self, start):
         """Breadth-First Search from start vertex"""
-        self.log.append({
-            'op': 'bfs_start',
-            'start': start,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('bfs_start', self.operation_count, start))
         self.operation_count += 1
 
         if start not in self.adj:
             return []
 
+        csr = self._fast_path(start)
+        if csr is not None:
+            order = _bfs_csr(csr['indptr'], csr['indices'], csr['index'][start])
+            vertices = csr['vertices']
+            result = [vertices[i] for i in order.tolist()]
+            # One visit per vertex, one discovery per non-start vertex, completion
+            self.operation_count += 2 * len(result)
+            return result
+
         visited = set()
         queue = deque([start])
         visited.add(start)
         result = [start]
+        # Count in a local and store it back once at the end
+        trace = self._trace
+        ops = self.operation_count
 
         while queue:
             vertex = queue.popleft()
             
-            self.log.append({
-                'op': 'bfs_visit',
-                'vertex': vertex,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
+            if trace:
+                self.log.append(LogEvent('bfs_visit', ops, vertex))
+            ops += 1
 
-            for neighbor in self.adj[vertex]:
+            for neighbor, _ in self.adj[vertex]:
                 if neighbor not in visited:
                     visited.add(neighbor)
                     queue.append(neighbor)
                     result.append(neighbor)
                     
-                    self.log.append({
-                        'op': 'bfs_discover',
-                        'from': vertex,
-                        'to': neighbor,
-                        'step': self.operation_count
-                    })
-                    self.operation_count += 1
+                    if trace:
+                        self.log.append(LogEvent('bfs_discover', ops, vertex, neighbor))
+                    ops += 1
 
-        self.log.append({
-            'op': 'bfs_complete',
-            'result': result,
-            'step': self.operation_count
-        })
-        self.operation_count += 1
+        if trace:
+            self.log.append(LogEvent('bfs_complete', ops, result))
+        self.operation_count = ops + 1
 
         return result
 
     def dfs(self, start):
         """Depth-First Search from start vertex"""
-        self.log.append({
-            'op': 'dfs_start',
-            'start': start,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('dfs_start', self.operation_count, start))
         self.operation_count += 1
 
         if start not in self.adj:
             return []
 
+        csr = self._fast_path(start)
+        if csr is not None:
+            order = _dfs_csr(csr['indptr'], csr['indices'], csr['index'][start])
+            vertices = csr['vertices']
+            result = [vertices[i] for i in order.tolist()]
+            # One visit per vertex, one discovery per non-start vertex, completion
+            self.operation_count += 2 * len(result)
+            return result
+
         visited = set()
         result = []
+        trace = self._trace
+        ops = self.operation_count
 
         def dfs_recursive(vertex):
+            nonlocal ops
             visited.add(vertex)
             result.append(vertex)
             
-            self.log.append({
-                'op': 'dfs_visit',
-                'vertex': vertex,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
+            if trace:
+                self.log.append(LogEvent('dfs_visit', ops, vertex))
+            ops += 1
 
-            for neighbor in self.adj[vertex]:
+            for neighbor, _ in self.adj[vertex]:
                 if neighbor not in visited:
-                    self.log.append({
-                        'op': 'dfs_discover',
-                        'from': vertex,
-                        'to': neighbor,
-                        'step': self.operation_count
-                    })
-                    self.operation_count += 1
+                    if trace:
+                        self.log.append(LogEvent('dfs_discover', ops, vertex, neighbor))
+                    ops += 1
                     dfs_recursive(neighbor)
 
         dfs_recursive(start)
 
-        self.log.append({
-            'op': 'dfs_complete',
-            'result': result,
-            'step': self.operation_count
-        })
-        self.operation_count += 1
+        if trace:
+            self.log.append(LogEvent('dfs_complete', ops, result))
+        self.operation_count = ops + 1
 
         return result
 
     def dijkstra(self, start, end=None):
         """Dijkstra's shortest path algorithm"""
-        self.log.append({
-            'op': 'dijkstra_start',
-            'start': start,
-            'end': end,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('dijkstra_start', self.operation_count, start, end))
         self.operation_count += 1
 
         if start not in self.adj:
             return {}
 
+        csr = self._fast_path(start)
+        if csr is not None:
+            return self._dijkstra_fast(csr, start, end)
+
         distances = {vertex: float('infinity') for vertex in self.adj}
         distances[start] = 0
         previous = {}
-        pq = [(0, start)]
         visited = set()
 
+        # With only 0/1 weights a deque kept in distance order (0-1 BFS)
+        # replaces the heap. Otherwise entries carry an insertion counter so
+        # ties never fall through to comparing vertices.
+        zero_one = all(weight == 0 or weight == 1
+                       for neighbors in self.adj.values() for _, weight in neighbors)
+        tie = count(1)
+        pq = deque([(0, 0, start)]) if zero_one else [(0, 0, start)]
+        trace = self._trace
+        ops = self.operation_count
+
         while pq:
-            current_distance, current_vertex = heapq.heappop(pq)
-            
+            if zero_one:
+                current_distance, _, current_vertex = pq.popleft()
+                popped = True
+            else:
+                # Peek, so the first push below can reuse the root slot
+                current_distance, _, current_vertex = pq[0]
+                popped = False
+
             if current_vertex in visited:
+                if not popped:
+                    heapq.heappop(pq)
                 continue
 
             visited.add(current_vertex)
             
-            self.log.append({
-                'op': 'dijkstra_visit',
-                'vertex': current_vertex,
-                'distance': current_distance,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
+            if trace:
+                self.log.append(LogEvent(
+                    'dijkstra_visit', ops, current_vertex, current_distance))
+            ops += 1
 
-            for neighbor in self.adj[current_vertex]:
-                weight = self.weights.get((current_vertex, neighbor), 1)
+            for neighbor, weight in self.adj[current_vertex]:
                 distance = current_distance + weight
+                best = distances[neighbor]
 
-                if distance < distances[neighbor]:
+                if distance < best:
                     distances[neighbor] = distance
                     previous[neighbor] = current_vertex
-                    heapq.heappush(pq, (distance, neighbor))
+                    entry = (distance, next(tie), neighbor)
+                    if zero_one:
+                        if weight:
+                            pq.append(entry)
+                        else:
+                            pq.appendleft(entry)
+                    elif popped:
+                        heapq.heappush(pq, entry)
+                    else:
+                        heapq.heapreplace(pq, entry)
+                        popped = True
                     
-                    self.log.append({
-                        'op': 'dijkstra_relax',
-                        'from': current_vertex,
-                        'to': neighbor,
-                        'new_distance': distance,
-                        'step': self.operation_count
-                    })
-                    self.operation_count += 1
+                    if trace:
+                        self.log.append(LogEvent(
+                            'dijkstra_relax', ops, current_vertex, neighbor, distance))
+                    ops += 1
 
             if end and current_vertex == end:
                 break
+            if not popped:
+                heapq.heappop(pq)
 
-        self.log.append({
-            'op': 'dijkstra_complete',
-            'distances': distances,
-            'step': self.operation_count
-        })
-        self.operation_count += 1
+        if trace:
+            self.log.append(LogEvent('dijkstra_complete', ops, distances))
+        self.operation_count = ops + 1
+
+        return distances, previous
 
+    def _dijkstra_fast(self, csr, start, end):
+        """dijkstra() on the compiled CSR kernel, converted back to dicts"""
+        index = csr['index']
+        target = index.get(end, -1) if end else -1
+        dist, prev, visits, relaxations = _dijkstra_csr(
+            csr['indptr'], csr['indices'], csr['weights'], index[start], target,
+            csr['zero_one'])
+        self.operation_count += visits + relaxations + 1
+
+        vertices = csr['vertices']
+        convert = int if csr['integral'] else float
+        distances = {}
+        for vertex, d in zip(vertices, dist.tolist()):
+            distances[vertex] = d if d == float('infinity') else convert(d)
+        previous = {vertices[v]: vertices[u] for v, u in enumerate(prev.tolist()) if u >= 0}
         return distances, previous
 
     def get_shortest_path(self, start, end):
@@ -256,82 +579,75 @@ class Graph:
             current = previous.get(current)
         path.reverse()
 
-        self.log.append({
-            'op': 'shortest_path',
-            'start': start,
-            'end': end,
-            'path': path,
-            'distance': distances[end],
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent(
+                'shortest_path', self.operation_count,
+                start, end, path, distances[end]))
         self.operation_count += 1
 
         return path, distances[end]
 
     def has_cycle(self):
         """Check if the graph has a cycle using DFS"""
-        self.log.append({
-            'op': 'cycle_detection_start',
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('cycle_detection_start', self.operation_count))
         self.operation_count += 1
 
         visited = set()
         rec_stack = set()
 
-        def has_cycle_dfs(vertex):
-            visited.add(vertex)
-            rec_stack.add(vertex)
-            
-            self.log.append({
-                'op': 'cycle_dfs_visit',
-                'vertex': vertex,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-
-            for neighbor in self.adj[vertex]:
-                if neighbor not in visited:
-                    if has_cycle_dfs(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    self.log.append({
-                        'op': 'cycle_found',
-                        'vertex': vertex,
-                        'neighbor': neighbor,
-                        'step': self.operation_count
-                    })
+        for vertex in list(self.adj):
+            if vertex not in visited:
+                if self._cycle_from(vertex, visited, rec_stack):
+                    if self._trace:
+                        self.log.append(LogEvent(
+                            'cycle_detection_complete', self.operation_count,
+                            True))
                     self.operation_count += 1
                     return True
 
-            rec_stack.remove(vertex)
-            return False
+        if self._trace:
+            self.log.append(LogEvent('cycle_detection_complete', self.operation_count, False))
+        self.operation_count += 1
+        return False
 
-        for vertex in self.adj:
-            if vertex not in visited:
-                if has_cycle_dfs(vertex):
-                    self.log.append({
-                        'op': 'cycle_detection_complete',
-                        'result': True,
-                        'step': self.operation_count
-                    })
+    def _cycle_from(self, root, visited, rec_stack):
+        """Iterative DFS from root; True as soon as a back edge is found"""
+        visited.add(root)
+        rec_stack.add(root)
+        if self._trace:
+            self.log.append(LogEvent('cycle_dfs_visit', self.operation_count, root))
+        self.operation_count += 1
+
+        # Each frame resumes its vertex's neighbor iterator where it left off
+        stack = [(root, iter(self.adj[root]))]
+        while stack:
+            vertex, neighbors = stack[-1]
+            for neighbor, _ in neighbors:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    rec_stack.add(neighbor)
+                    if self._trace:
+                        self.log.append(LogEvent('cycle_dfs_visit', self.operation_count, neighbor))
+                    self.operation_count += 1
+                    stack.append((neighbor, iter(self.adj[neighbor])))
+                    break
+                elif neighbor in rec_stack:
+                    if self._trace:
+                        self.log.append(LogEvent(
+                            'cycle_found', self.operation_count,
+                            vertex, neighbor))
                     self.operation_count += 1
                     return True
-
-        self.log.append({
-            'op': 'cycle_detection_complete',
-            'result': False,
-            'step': self.operation_count
-        })
-        self.operation_count += 1
+            else:
+                stack.pop()
+                rec_stack.remove(vertex)
         return False
 
     def topological_sort(self):
         """Topological sort using DFS (only for DAGs)"""
-        self.log.append({
-            'op': 'topological_sort_start',
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('topological_sort_start', self.operation_count))
         self.operation_count += 1
 
         if not self.directed:
@@ -341,63 +657,68 @@ class Graph:
         temp_visited = set()
         result = []
 
-        def topological_dfs(vertex):
-            if vertex in temp_visited:
-                return False  # Cycle detected
-            if vertex in visited:
-                return True
-
-            temp_visited.add(vertex)
-            
-            self.log.append({
-                'op': 'topological_dfs_visit',
-                'vertex': vertex,
-                'step': self.operation_count
-            })
-            self.operation_count += 1
-
-            for neighbor in self.adj[vertex]:
-                if not topological_dfs(neighbor):
-                    return False
-
-            temp_visited.remove(vertex)
-            visited.add(vertex)
-            result.append(vertex)
-            return True
-
-        for vertex in self.adj:
+        for vertex in list(self.adj):
             if vertex not in visited:
-                if not topological_dfs(vertex):
-                    self.log.append({
-                        'op': 'topological_sort_cycle',
-                        'step': self.operation_count
-                    })
+                if not self._topological_visit(vertex, visited, temp_visited, result):
+                    if self._trace:
+                        self.log.append(LogEvent('topological_sort_cycle', self.operation_count))
                     self.operation_count += 1
                     return None
 
         result.reverse()
         
-        self.log.append({
-            'op': 'topological_sort_complete',
-            'result': result,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(LogEvent('topological_sort_complete', self.operation_count, result))
         self.operation_count += 1
 
         return result
 
+    def _topological_visit(self, root, visited, temp_visited, result):
+        """Iterative DFS appending vertices in post-order; False on a cycle"""
+        temp_visited.add(root)
+        if self._trace:
+            self.log.append(LogEvent('topological_dfs_visit', self.operation_count, root))
+        self.operation_count += 1
+
+        stack = [(root, iter(self.adj[root]))]
+        while stack:
+            vertex, neighbors = stack[-1]
+            for neighbor, _ in neighbors:
+                if neighbor in temp_visited:
+                    return False  # Cycle detected
+                if neighbor not in visited:
+                    temp_visited.add(neighbor)
+                    if self._trace:
+                        self.log.append(LogEvent(
+                            'topological_dfs_visit', self.operation_count, neighbor))
+                    self.operation_count += 1
+                    stack.append((neighbor, iter(self.adj[neighbor])))
+                    break
+            else:
+                stack.pop()
+                temp_visited.remove(vertex)
+                visited.add(vertex)
+                result.append(vertex)
+        return True
+
     def get_adjacency_matrix(self):
         """Get adjacency matrix representation"""
-        vertices = list(self.adj.keys())
-        n = len(vertices)
-        matrix = [[0] * n for _ in range(n)]
-        
-        for i, u in enumerate(vertices):
-            for j, v in enumerate(vertices):
-                if v in self.adj[u]:
-                    matrix[i][j] = self.weights.get((u, v), 1)
-
-        return matrix, vertices
+        # Traversals can add sink vertices to adj, so reuse the snapshot only
+        # while it still covers every adjacency key, in adjacency order
+        csr = self._current_csr()
+        n = len(self.adj)
+        # Adjacency keys come first in the CSR order; sink-only vertices
+        # past them have no row or column here
+        vertices = csr['vertices'][:n]
+        indptr = csr['indptr']
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        cols = csr['indices']
+        keep = cols < n
+
+        matrix = np.zeros((n, n), dtype=np.int64 if csr['integral'] else np.float64)
+        matrix[rows[keep], cols[keep]] = csr['weights'][keep]
+
+        return matrix.tolist(), vertices
 
     def get_degree(self, vertex):
         """Get the degree of a vertex"""
@@ -412,14 +733,7 @@ class Graph:
         
         start_vertex = next(iter(self.adj))
         visited = set()
-        
-        def dfs_connected(vertex):
-            visited.add(vertex)
-            for neighbor in self.adj[vertex]:
-                if neighbor not in visited:
-                    dfs_connected(neighbor)
-        
-        dfs_connected(start_vertex)
+        self._preorder(start_vertex, visited)
         return len(visited) == len(self.adj)
 
     def get_connected_components(self):
@@ -427,32 +741,40 @@ class Graph:
         visited = set()
         components = []
 
-        def dfs_component(vertex, component):
-            visited.add(vertex)
-            component.append(vertex)
-            for neighbor in self.adj[vertex]:
-                if neighbor not in visited:
-                    dfs_component(neighbor, component)
-
-        for vertex in self.adj:
+        for vertex in list(self.adj):
             if vertex not in visited:
-                component = []
-                dfs_component(vertex, component)
-                components.append(component)
+                components.append(self._preorder(vertex, visited))
 
         return components
 
+    def _preorder(self, start, visited):
+        """Vertices first reached from start, in DFS preorder, marking them visited"""
+        visited.add(start)
+        order = [start]
+        stack = [iter(self.adj[start])]
+        while stack:
+            for neighbor, _ in stack[-1]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    order.append(neighbor)
+                    stack.append(iter(self.adj[neighbor]))
+                    break
+            else:
+                stack.pop()
+        return order
+
     def step(self):
         """Return the next operation for visualization"""
         if self.log:
-            return self.log.pop(0)
+            return self.log.popleft().to_dict(_LOG_FIELDS)
         return None
 
     def reset(self):
         """Reset the graph and operation log"""
         self.adj.clear()
-        self.weights.clear()
-        self.log = []
+        self.rev.clear()
+        self._csr = None
+        self.log = deque()
         self.operation_count = 0
 
     def get_statistics(self):
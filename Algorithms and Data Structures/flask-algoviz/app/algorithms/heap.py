@@ -1,9 +1,300 @@
+import heapq
+
+import numpy as np
+
+from .log_event import ColumnLog
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; without it bulk builds use the NumPy level sift
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Field names for each logged op, attached when step() hands an entry out
+_LOG_FIELDS = {
+    'swap': ('index1', 'index2', 'value1', 'value2'),
+    'peek': ('value',),
+    'insert_start': ('value',),
+    'insert_append': ('value', 'index'),
+    'insert_complete': ('value',),
+    'bubble_up_compare': ('current_index', 'parent_index', 'current_value', 'parent_value', 'should_swap'),
+    'extract_empty': (),
+    'extract_start': ('root_value',),
+    'extract_replace_root': ('new_root_value',),
+    'extract_complete': ('extracted_value',),
+    'bubble_down_compare': ('current_index', 'child_index', 'current_value', 'child_value', 'should_swap'),
+    'heapify_start': ('array',),
+    'heapify_complete': ('size', 'result'),
+    'heap_sort_start': ('array',),
+    'heap_sort_complete': ('result',),
+    'delete_invalid_index': ('index',),
+    'delete_start': ('index', 'value'),
+    'delete_complete': (),
+    'change_priority_invalid_index': ('index',),
+    'change_priority_start': ('index', 'old_value', 'new_value'),
+    'change_priority_complete': ('index', 'old_value', 'new_value'),
+}
+
+# Op codes stored in the log, in _LOG_FIELDS order
+(_OP_SWAP,
+ _OP_PEEK,
+ _OP_INSERT_START,
+ _OP_INSERT_APPEND,
+ _OP_INSERT_COMPLETE,
+ _OP_BUBBLE_UP_COMPARE,
+ _OP_EXTRACT_EMPTY,
+ _OP_EXTRACT_START,
+ _OP_EXTRACT_REPLACE_ROOT,
+ _OP_EXTRACT_COMPLETE,
+ _OP_BUBBLE_DOWN_COMPARE,
+ _OP_HEAPIFY_START,
+ _OP_HEAPIFY_COMPLETE,
+ _OP_HEAP_SORT_START,
+ _OP_HEAP_SORT_COMPLETE,
+ _OP_DELETE_INVALID_INDEX,
+ _OP_DELETE_START,
+ _OP_DELETE_COMPLETE,
+ _OP_CHANGE_PRIORITY_INVALID_INDEX,
+ _OP_CHANGE_PRIORITY_START,
+ _OP_CHANGE_PRIORITY_COMPLETE) = range(len(_LOG_FIELDS))
+
+
+@njit(cache=True)
+def _sift_down(keys, order, i, n, is_min):
+    """Sift keys[i] down within keys[:n], carrying order along"""
+    key = keys[i]
+    item = order[i]
+    child = 2 * i + 1
+    while child < n:
+        # Step to the right sibling arithmetically rather than by branch, so
+        # LLVM can emit a select. Without a right sibling, right == child and
+        # the comparison is False.
+        right = min(child + 1, n - 1)
+        if is_min:
+            child += keys[right] < keys[child]
+            if not keys[child] < key:
+                break
+        else:
+            child += keys[right] > keys[child]
+            if not keys[child] > key:
+                break
+        keys[i] = keys[child]
+        order[i] = order[child]
+        i = child
+        child = 2 * i + 1
+    keys[i] = key
+    order[i] = item
+
+
+# Heap size above which _build_heap switches to post-order construction
+_POSTORDER_BUILD_MIN = 1 << 21
+
+
+@njit(cache=True)
+def _build_heap(keys, order, is_min):
+    """Bottom-up heap construction, visiting parents in post-order
+
+    A sift only moves keys inside the node's own subtree, so any order that
+    finishes both children before their parent gives the same heap as the
+    usual reverse-index loop. Post-order completes each subtree while it is
+    still cached, where the reverse loop sweeps every level below once per
+    level and misses on large inputs. Inputs that fit in cache keep the
+    plain loop, which has less bookkeeping.
+    """
+    n = keys.shape[0]
+    last_parent = (n - 2) // 2
+    if n < _POSTORDER_BUILD_MIN:
+        for i in range(last_parent, -1, -1):
+            _sift_down(keys, order, i, n, is_min)
+        return
+    stack = np.empty(64, np.int64)
+    top = 0
+    node = 0
+    prev = -1
+    while top > 0 or node <= last_parent:
+        if node <= last_parent:
+            stack[top] = node
+            top += 1
+            node = 2 * node + 1
+        else:
+            parent = stack[top - 1]
+            right = 2 * parent + 2
+            if right <= last_parent and prev != right:
+                node = right
+            else:
+                _sift_down(keys, order, parent, n, is_min)
+                prev = parent
+                top -= 1
+                # Leaves are never sifted; n stands in for "no node"
+                node = n
+
+
+# Input size above which _heap_sort_order switches to a 4-ary heap
+_DARY_SORT_MIN = 1 << 18
+
+
+@njit(cache=True)
+def _sift_down_4(keys, order, i, n, is_min):
+    """_sift_down for a 4-ary heap, where node i has children 4i+1..4i+4
+
+    Half the levels of a binary heap, and the four children of a node are
+    adjacent, so a level costs one or two cache lines instead of one per
+    level of the binary tree.
+    """
+    key = keys[i]
+    item = order[i]
+    first = 4 * i + 1
+    while first < n:
+        if first + 3 < n:
+            # Full family: a two-round tournament of selects, no branches
+            if is_min:
+                a = first + (keys[first + 1] < keys[first])
+                b = first + 2 + (keys[first + 3] < keys[first + 2])
+                best = b if keys[b] < keys[a] else a
+            else:
+                a = first + (keys[first + 1] > keys[first])
+                b = first + 2 + (keys[first + 3] > keys[first + 2])
+                best = b if keys[b] > keys[a] else a
+        else:
+            best = first
+            for c in range(first + 1, n):
+                if (keys[c] < keys[best]) if is_min else (keys[c] > keys[best]):
+                    best = c
+        if not ((keys[best] < key) if is_min else (keys[best] > key)):
+            break
+        keys[i] = keys[best]
+        order[i] = order[best]
+        i = best
+        first = 4 * i + 1
+    keys[i] = key
+    order[i] = item
+
+
+@njit(cache=True)
+def _heap_sort_order(keys, order, is_min):
+    """Heap-sort in place; order ends up in reverse extraction order
+
+    The heap never leaves this kernel, so inputs too big for cache use the
+    shallower 4-ary layout rather than the binary one Heap exposes. Below
+    that the binary sift's single compare per level is cheaper.
+    """
+    n = keys.shape[0]
+    if n < _DARY_SORT_MIN:
+        _build_heap(keys, order, is_min)
+        for end in range(n - 1, 0, -1):
+            keys[0], keys[end] = keys[end], keys[0]
+            order[0], order[end] = order[end], order[0]
+            _sift_down(keys, order, 0, end, is_min)
+        return
+    for i in range((n - 2) // 4, -1, -1):
+        _sift_down_4(keys, order, i, n, is_min)
+    for end in range(n - 1, 0, -1):
+        keys[0], keys[end] = keys[end], keys[0]
+        order[0], order[end] = order[end], order[0]
+        _sift_down_4(keys, order, 0, end, is_min)
+
+
+def _numeric_keys(array):
+    """array as a fresh 1-D numeric ndarray, or None if it is not one
+
+    Lists qualify only when every item is an int or every item is a float;
+    mixed ones would become float64 keys and order large ints wrongly.
+    """
+    if not isinstance(array, np.ndarray):
+        item_types = set(map(type, array))
+        if item_types != {int} and item_types != {float}:
+            return None
+    keys = np.asarray(array)
+    if keys.ndim != 1 or keys.dtype.kind not in 'iuf':
+        return None
+    return keys.copy()
+
+
+def _sift_down_levels(keys, order, is_min):
+    """Bottom-up heap construction, sifting a whole tree level per pass
+
+    Nodes on one level head disjoint subtrees, so they sift down together
+    as NumPy index arrays. The result matches sifting them one at a time.
+    keys and order are permuted in place.
+    """
+    n = keys.shape[0]
+    last_parent = (n - 2) // 2
+    if last_parent < 0:
+        return
+    level = (last_parent + 1).bit_length() - 1
+    while level >= 0:
+        first = (1 << level) - 1
+        nodes = np.arange(first, min(2 * first, last_parent) + 1)
+        while nodes.size:
+            child = 2 * nodes + 1
+            right = np.minimum(child + 1, n - 1)
+            if is_min:
+                child = np.where((right > child) & (keys[right] < keys[child]), right, child)
+                move = keys[child] < keys[nodes]
+            else:
+                child = np.where((right > child) & (keys[right] > keys[child]), right, child)
+                move = keys[child] > keys[nodes]
+            nodes = nodes[move]
+            child = child[move]
+            keys[nodes], keys[child] = keys[child], keys[nodes]
+            order[nodes], order[child] = order[child], order[nodes]
+            nodes = child[child <= last_parent]
+        level -= 1
+
+
+def _veb_order(root, height, out):
+    """Append the BFS indices of a perfect subtree in van Emde Boas order
+
+    The subtree is cut at half its height. Its top half is laid out first,
+    then each bottom subtree from left to right, both recursively.
+    """
+    if height == 1:
+        out.append(root)
+        return
+    top = height // 2
+    _veb_order(root, top, out)
+    # Descendants `top` levels below root sit contiguously in BFS order
+    first = (root + 1) * (1 << top) - 1
+    for bottom_root in range(first, first + (1 << top)):
+        _veb_order(bottom_root, height - top, out)
+
+
 class Heap:
-    def __init__(self, min_heap=True):
+    def __init__(self, min_heap=True, trace=False):
         self.data = []
         self.min_heap = min_heap
-        self.log = []
+        # vEB slot order for get_heap_structure_veb, per tree height
+        self._veb_height = 0
+        self._veb_perm = []
+        self._veb_pos = []
+        self.log = ColumnLog(_LOG_FIELDS)
         self.operation_count = 0
+        # Operation logging is only needed while visualizing
+        self._trace = trace
+
+    def enable_trace(self):
+        """Start recording operations for visualization"""
+        self._trace = True
+
+    def disable_trace(self):
+        """Stop recording operations"""
+        self._trace = False
+
+    def _uses_heapq(self):
+        """Whether insert/extract/heapify can hand off to the C heapq module
+
+        heapq only orders min-heaps, and it does not report the individual
+        compares and swaps the trace needs, so operation_count only counts
+        the fixed steps of each call on this path.
+        """
+        return self.min_heap and not self._trace
 
     def parent(self, index):
         """Get parent index of a given index"""
@@ -33,14 +324,10 @@ class Heap:
         """Swap two elements in the heap"""
         self.data[index1], self.data[index2] = self.data[index2], self.data[index1]
         
-        self.log.append({
-            'op': 'swap',
-            'index1': index1,
-            'index2': index2,
-            'value1': self.data[index1],
-            'value2': self.data[index2],
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(
+                _OP_SWAP, self.operation_count,
+                index1, index2, self.data[index1], self.data[index2])
         self.operation_count += 1
 
     def peek(self):
@@ -48,11 +335,8 @@ class Heap:
         if len(self.data) == 0:
             return None
         
-        self.log.append({
-            'op': 'peek',
-            'value': self.data[0],
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(_OP_PEEK, self.operation_count, self.data[0])
         self.operation_count += 1
         
         return self.data[0]
@@ -67,36 +351,59 @@ class Heap:
 
     def insert(self, value):
         """Insert a new value into the heap"""
-        self.log.append({
-            'op': 'insert_start',
-            'value': value,
-            'step': self.operation_count
-        })
+        if self._uses_heapq():
+            heapq.heappush(self.data, value)
+            self.operation_count += 3
+            return
+
+        if self._trace:
+            self.log.append(_OP_INSERT_START, self.operation_count, value)
         self.operation_count += 1
 
         # Add the new element to the end
         self.data.append(value)
         
-        self.log.append({
-            'op': 'insert_append',
-            'value': value,
-            'index': len(self.data) - 1,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(
+                _OP_INSERT_APPEND, self.operation_count,
+                value, len(self.data) - 1)
         self.operation_count += 1
 
         # Bubble up the new element
         self._bubble_up(len(self.data) - 1)
         
-        self.log.append({
-            'op': 'insert_complete',
-            'value': value,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(_OP_INSERT_COMPLETE, self.operation_count, value)
         self.operation_count += 1
 
     def _bubble_up(self, index):
         """Bubble up an element to maintain heap property"""
+        if self._trace:
+            self._bubble_up_traced(index)
+            return
+
+        # Hold the moving value and shift parents down into the hole, so
+        # each level costs one write instead of a swap
+        data = self.data
+        is_min = self.min_heap
+        value = data[index]
+        ops = 0
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent_value = data[parent_index]
+            ops += 1
+            if (value < parent_value) if is_min else (value > parent_value):
+                data[index] = parent_value
+                index = parent_index
+                ops += 1
+            else:
+                break
+        data[index] = value
+        # One compare per level plus one per swap, as the traced path counts
+        self.operation_count += ops
+
+    def _bubble_up_traced(self, index):
+        """_bubble_up that logs every compare and swap"""
         while self.has_parent(index):
             parent_index = self.parent(index)
             
@@ -106,47 +413,36 @@ class Heap:
                          (not self.min_heap and self.data[index] > self.data[parent_index])
             
             if should_swap:
-                self.log.append({
-                    'op': 'bubble_up_compare',
-                    'current_index': index,
-                    'parent_index': parent_index,
-                    'current_value': self.data[index],
-                    'parent_value': self.data[parent_index],
-                    'should_swap': True,
-                    'step': self.operation_count
-                })
+                if self._trace:
+                    self.log.append(
+                        _OP_BUBBLE_UP_COMPARE, self.operation_count,
+                        index, parent_index, self.data[index], self.data[parent_index], True)
                 self.operation_count += 1
                 
                 self.swap(index, parent_index)
                 index = parent_index
             else:
-                self.log.append({
-                    'op': 'bubble_up_compare',
-                    'current_index': index,
-                    'parent_index': parent_index,
-                    'current_value': self.data[index],
-                    'parent_value': self.data[parent_index],
-                    'should_swap': False,
-                    'step': self.operation_count
-                })
+                if self._trace:
+                    self.log.append(
+                        _OP_BUBBLE_UP_COMPARE, self.operation_count,
+                        index, parent_index, self.data[index], self.data[parent_index], False)
                 self.operation_count += 1
                 break
 
     def extract(self):
         """Extract the root element from the heap"""
         if self.is_empty():
-            self.log.append({
-                'op': 'extract_empty',
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(_OP_EXTRACT_EMPTY, self.operation_count)
             self.operation_count += 1
             return None
 
-        self.log.append({
-            'op': 'extract_start',
-            'root_value': self.data[0],
-            'step': self.operation_count
-        })
+        if self._uses_heapq():
+            self.operation_count += 3
+            return heapq.heappop(self.data)
+
+        if self._trace:
+            self.log.append(_OP_EXTRACT_START, self.operation_count, self.data[0])
         self.operation_count += 1
 
         # Get the root element
@@ -156,28 +452,55 @@ class Heap:
         self.data[0] = self.data[-1]
         self.data.pop()
         
-        self.log.append({
-            'op': 'extract_replace_root',
-            'new_root_value': self.data[0] if self.data else None,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(
+                _OP_EXTRACT_REPLACE_ROOT, self.operation_count,
+                self.data[0] if self.data else None)
         self.operation_count += 1
 
         # Bubble down the new root
         if self.data:
             self._bubble_down(0)
         
-        self.log.append({
-            'op': 'extract_complete',
-            'extracted_value': root,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(_OP_EXTRACT_COMPLETE, self.operation_count, root)
         self.operation_count += 1
 
         return root
 
     def _bubble_down(self, index):
         """Bubble down an element to maintain heap property"""
+        if self._trace:
+            self._bubble_down_traced(index)
+            return
+
+        data = self.data
+        size = len(data)
+        is_min = self.min_heap
+        value = data[index]
+        ops = 0
+        child_index = 2 * index + 1
+        while child_index < size:
+            child_value = data[child_index]
+            right_child_index = child_index + 1
+            if right_child_index < size:
+                right_value = data[right_child_index]
+                if (right_value < child_value) if is_min else (right_value > child_value):
+                    child_index = right_child_index
+                    child_value = right_value
+            ops += 1
+            if (value > child_value) if is_min else (value < child_value):
+                data[index] = child_value
+                index = child_index
+                child_index = 2 * index + 1
+                ops += 1
+            else:
+                break
+        data[index] = value
+        self.operation_count += ops
+
+    def _bubble_down_traced(self, index):
+        """_bubble_down that logs every compare and swap"""
         while self.has_left_child(index):
             # Find the smaller (min heap) or larger (max heap) child
             smaller_child_index = self.left_child(index)
@@ -195,78 +518,103 @@ class Heap:
                          (not self.min_heap and self.data[index] < self.data[smaller_child_index])
             
             if should_swap:
-                self.log.append({
-                    'op': 'bubble_down_compare',
-                    'current_index': index,
-                    'child_index': smaller_child_index,
-                    'current_value': self.data[index],
-                    'child_value': self.data[smaller_child_index],
-                    'should_swap': True,
-                    'step': self.operation_count
-                })
+                if self._trace:
+                    self.log.append(
+                        _OP_BUBBLE_DOWN_COMPARE, self.operation_count,
+                        index, smaller_child_index, self.data[index], self.data[smaller_child_index], True)
                 self.operation_count += 1
                 
                 self.swap(index, smaller_child_index)
                 index = smaller_child_index
             else:
-                self.log.append({
-                    'op': 'bubble_down_compare',
-                    'current_index': index,
-                    'child_index': smaller_child_index,
-                    'current_value': self.data[index],
-                    'child_value': self.data[smaller_child_index],
-                    'should_swap': False,
-                    'step': self.operation_count
-                })
+                if self._trace:
+                    self.log.append(
+                        _OP_BUBBLE_DOWN_COMPARE, self.operation_count,
+                        index, smaller_child_index, self.data[index], self.data[smaller_child_index], False)
                 self.operation_count += 1
                 break
 
-    def heapify(self, array):
-        """Build a heap from an array"""
-        self.log.append({
-            'op': 'heapify_start',
-            'array': array.copy(),
-            'step': self.operation_count
-        })
+    def heapify(self, array, snapshot=False):
+        """Build a heap from an array
+
+        The heapify_complete entry records the heap size; pass snapshot=True
+        to also log a copy of the finished heap.
+        """
+        if self._trace:
+            self.log.append(_OP_HEAPIFY_START, self.operation_count, array.copy())
         self.operation_count += 1
 
-        self.data = array.copy()
+        self.data = list(array)
         
-        # Start from the last non-leaf node and bubble down
-        for i in range(self.parent(len(self.data) - 1), -1, -1):
-            self._bubble_down(i)
+        if self._uses_heapq():
+            heapq.heapify(self.data)
+        else:
+            # Start from the last non-leaf node and bubble down
+            for i in range(self.parent(len(self.data) - 1), -1, -1):
+                self._bubble_down(i)
         
-        self.log.append({
-            'op': 'heapify_complete',
-            'result': self.data.copy(),
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(
+                _OP_HEAPIFY_COMPLETE, self.operation_count,
+                len(self.data), self.data.copy() if snapshot else None
+            )
         self.operation_count += 1
 
+    def heapify_fast(self, array):
+        """heapify() without per-step logging, vectorized for numeric input
+
+        Numeric arrays are sifted level by level with NumPy. The original
+        values are then placed in heap order, so self.data stays a list of
+        the caller's objects. With tracing on this is plain heapify(), so
+        visualizations still get every step.
+        """
+        if self._trace:
+            self.heapify(array)
+            return
+
+        keys = _numeric_keys(array)
+        if keys is None:
+            self.heapify(array)
+            return
+
+        order = np.arange(len(array))
+        if NUMBA_AVAILABLE:
+            _build_heap(keys, order, self.min_heap)
+        else:
+            _sift_down_levels(keys, order, self.min_heap)
+        self.data = [array[i] for i in order.tolist()]
+        # heapify_start and heapify_complete
+        self.operation_count += 2
+
     def heap_sort(self, array):
         """Sort an array using heap sort"""
-        self.log.append({
-            'op': 'heap_sort_start',
-            'array': array.copy(),
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(_OP_HEAP_SORT_START, self.operation_count, array.copy())
         self.operation_count += 1
 
+        keys = None if self._trace or not NUMBA_AVAILABLE else _numeric_keys(array)
+        if keys is not None:
+            # Whole sort in one compiled kernel; counts match heapify_fast
+            # plus the fixed steps of each heapq-path extract
+            order = np.arange(len(array))
+            _heap_sort_order(keys, order, self.min_heap)
+            sorted_array = [array[i] for i in order[::-1].tolist()]
+            self.data = []
+            self.operation_count += 2 + 3 * len(sorted_array) + 1
+            return sorted_array
+
         # Build heap
-        self.heapify(array)
+        self.heapify_fast(array)
         
         # Extract elements one by one
-        sorted_array = []
-        original_size = len(self.data)
+        n = len(self.data)
+        sorted_array = [None] * n
         
-        for i in range(original_size):
-            sorted_array.append(self.extract())
+        for i in range(n):
+            sorted_array[i] = self.extract()
         
-        self.log.append({
-            'op': 'heap_sort_complete',
-            'result': sorted_array,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(_OP_HEAP_SORT_COMPLETE, self.operation_count, sorted_array)
         self.operation_count += 1
         
         return sorted_array
@@ -274,20 +622,13 @@ class Heap:
     def delete(self, index):
         """Delete an element at a specific index"""
         if index >= len(self.data):
-            self.log.append({
-                'op': 'delete_invalid_index',
-                'index': index,
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(_OP_DELETE_INVALID_INDEX, self.operation_count, index)
             self.operation_count += 1
             return False
 
-        self.log.append({
-            'op': 'delete_start',
-            'index': index,
-            'value': self.data[index],
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(_OP_DELETE_START, self.operation_count, index, self.data[index])
         self.operation_count += 1
 
         # Replace with the last element
@@ -296,10 +637,8 @@ class Heap:
         
         # If we deleted the last element, we're done
         if index >= len(self.data):
-            self.log.append({
-                'op': 'delete_complete',
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(_OP_DELETE_COMPLETE, self.operation_count)
             self.operation_count += 1
             return True
 
@@ -316,33 +655,27 @@ class Heap:
         else:
             self._bubble_down(index)
 
-        self.log.append({
-            'op': 'delete_complete',
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(_OP_DELETE_COMPLETE, self.operation_count)
         self.operation_count += 1
         return True
 
     def change_priority(self, index, new_value):
         """Change the priority of an element at a specific index"""
         if index >= len(self.data):
-            self.log.append({
-                'op': 'change_priority_invalid_index',
-                'index': index,
-                'step': self.operation_count
-            })
+            if self._trace:
+                self.log.append(
+                    _OP_CHANGE_PRIORITY_INVALID_INDEX, self.operation_count,
+                    index)
             self.operation_count += 1
             return False
 
         old_value = self.data[index]
         
-        self.log.append({
-            'op': 'change_priority_start',
-            'index': index,
-            'old_value': old_value,
-            'new_value': new_value,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(
+                _OP_CHANGE_PRIORITY_START, self.operation_count,
+                index, old_value, new_value)
         self.operation_count += 1
 
         self.data[index] = new_value
@@ -360,13 +693,10 @@ class Heap:
         else:
             self._bubble_down(index)
 
-        self.log.append({
-            'op': 'change_priority_complete',
-            'index': index,
-            'old_value': old_value,
-            'new_value': new_value,
-            'step': self.operation_count
-        })
+        if self._trace:
+            self.log.append(
+                _OP_CHANGE_PRIORITY_COMPLETE, self.operation_count,
+                index, old_value, new_value)
         self.operation_count += 1
         return True
 
@@ -388,16 +718,58 @@ class Heap:
         
         return build_tree(0)
 
+    def get_heap_structure_veb(self):
+        """get_heap_structure(), walked over a van Emde Boas-ordered copy
+
+        Copying the values into vEB order keeps each recursive block of the
+        tree contiguous, so a root-to-leaf walk crosses O(log_B n) blocks
+        instead of one per level. The returned tree is the same as
+        get_heap_structure(), including the original 'index' of each node.
+        """
+        if not self.data:
+            return None
+
+        size = len(self.data)
+        height = size.bit_length()
+        if height != self._veb_height:
+            # The permutation covers the perfect tree of this height, so it
+            # only changes when the size crosses a power of two
+            perm = []
+            _veb_order(0, height, perm)
+            pos = [0] * len(perm)
+            for slot, index in enumerate(perm):
+                pos[index] = slot
+            self._veb_height = height
+            self._veb_perm = perm
+            self._veb_pos = pos
+
+        perm = self._veb_perm
+        pos = self._veb_pos
+        values = [self.data[index] if index < size else None for index in perm]
+
+        def build_tree(slot):
+            index = perm[slot]
+            left = 2 * index + 1
+            right = left + 1
+            return {
+                'value': values[slot],
+                'index': index,
+                'left': build_tree(pos[left]) if left < size else None,
+                'right': build_tree(pos[right]) if right < size else None
+            }
+
+        return build_tree(pos[0])
+
     def step(self):
         """Return the next operation for visualization"""
         if self.log:
-            return self.log.pop(0)
+            return self.log.popleft().to_dict(_LOG_FIELDS)
         return None
 
     def reset(self):
         """Reset the heap and operation log"""
         self.data = []
-        self.log = []
+        self.log = ColumnLog(_LOG_FIELDS)
         self.operation_count = 0
 
     def get_statistics(self):
@@ -411,6 +783,4 @@ class Heap:
 
     def _calculate_height(self):
         """Calculate the height of the heap"""
-        if not self.data:
-            return 0
-        return len(bin(len(self.data))) - 2  # log2(n) + 1 
\ No newline at end of file
+        return len(self.data).bit_length()  # floor(log2(n)) + 1, 0 when empty 
\ No newline at end of file
@@ -0,0 +1,94 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+class LogEvent(namedtuple('LogEvent', ['op', 'step', 'a', 'b', 'c', 'd', 'e'],
+                          defaults=(None, None, None, None, None))):
+    """Compact operation log entry: op name, step number and positional fields
+
+    Field names live in a per-module schema (op -> names) and are only
+    attached when an entry is handed to the frontend.
+    """
+    __slots__ = ()
+
+    def to_dict(self, fields):
+        """Expand into the {'op': ..., <fields>, 'step': ...} dict the frontend reads"""
+        event = {'op': self.op}
+        event.update(zip(fields[self.op], self[2:]))
+        event['step'] = self.step
+        return event
+
+
+class ColumnLog:
+    """FIFO operation log stored column-wise in preallocated NumPy arrays
+
+    Each row is an op code, a step number and up to five payload values, so
+    appending writes into existing arrays instead of allocating an object
+    per event. popleft() rebuilds the row as a LogEvent. Drained space is
+    reused, and live rows are compacted to the front before growing.
+    """
+
+    def __init__(self, ops, capacity=64):
+        self.ops = tuple(ops)
+        self._op = np.empty(capacity, dtype=np.int8)
+        self._step = np.empty(capacity, dtype=np.int64)
+        self._payload = [np.empty(capacity, dtype=object) for _ in range(5)]
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self):
+        return self._tail - self._head
+
+    def append(self, op, step, a=None, b=None, c=None, d=None, e=None):
+        """Record op (an index into self.ops) with its payload"""
+        row = self._tail
+        if row == len(self._op):
+            row = self._make_room()
+        self._op[row] = op
+        self._step[row] = step
+        col_a, col_b, col_c, col_d, col_e = self._payload
+        col_a[row] = a
+        col_b[row] = b
+        col_c[row] = c
+        col_d[row] = d
+        col_e[row] = e
+        self._tail = row + 1
+
+    def popleft(self):
+        """Remove and return the oldest row as a LogEvent"""
+        row = self._head
+        if row == self._tail:
+            raise IndexError('pop from an empty log')
+        payload = []
+        for column in self._payload:
+            payload.append(column[row])
+            column[row] = None
+        event = LogEvent(self.ops[self._op[row]], int(self._step[row]), *payload)
+        self._head = row + 1
+        if self._head == self._tail:
+            self._head = self._tail = 0
+        return event
+
+    def _make_room(self):
+        """Compact live rows to the front, doubling capacity if over half full
+
+        Returns the first free row.
+        """
+        head = self._head
+        live = self._tail - head
+        capacity = len(self._op)
+        if 2 * live > capacity:
+            capacity *= 2
+
+        def moved(column):
+            fresh = np.empty(capacity, dtype=column.dtype)
+            fresh[:live] = column[head:head + live]
+            return fresh
+
+        self._op = moved(self._op)
+        self._step = moved(self._step)
+        self._payload = [moved(column) for column in self._payload]
+        self._head = 0
+        self._tail = live
+        return live
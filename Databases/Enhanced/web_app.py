@@ -8,21 +8,92 @@ Features:
 - Tags system integration
 """
 
-from flask import Flask, request, jsonify, render_template, redirect, url_for, flash
+from flask import Flask, request, jsonify, render_template, redirect, url_for, flash, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import bindparam, event, func, text, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import selectinload
 from datetime import datetime
+from functools import lru_cache, wraps
+import base64
+import hashlib
 import json
 import os
 import re
+import sqlite3
 from typing import Dict, List, Optional, Any
 
+try:
+    import orjson  # faster parse/dump for metadata blobs
+except ImportError:
+    orjson = None
+
+try:
+    import re2  # google-re2: linear-time DFA matcher, same API as re
+except ImportError:
+    re2 = None
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///contacts_enhanced.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# A pool of connections shared by the worker's threads/greenlets
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'pool_pre_ping': True,
+    'connect_args': {'check_same_thread': False},
+}
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson instead of the json module.
+    
+    Covers jsonify() and the tojson template filter. Types orjson does not
+    know fall back to Flask's default handler.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype
+        )
+
+if orjson:
+    app.json = OrjsonProvider(app)
 
 db = SQLAlchemy(app)
 
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Put SQLite in WAL mode so readers don't block the writer."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+_EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+_EMAIL_RE = (re2 or re).compile(_EMAIL_PATTERN)
+
+def _json_loads(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _json_dumps(obj):
+    return orjson.dumps(obj).decode() if orjson else json.dumps(obj)
+
 # Database Models
 class Contact(db.Model):
     __tablename__ = 'contacts'
@@ -32,16 +103,34 @@ class Contact(db.Model):
     email = db.Column(db.String(100), unique=True)
     phone = db.Column(db.String(20))
     address = db.Column(db.Text)
-    metadata = db.Column(db.Text, default='{}')
+    # Declarative reserves the name 'metadata', so the column maps to 'meta'
+    meta = db.Column('metadata', db.Text, db.CheckConstraint('json_valid(metadata)'), default='{}')  # JSON
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Serves the (name, id) ordering and keyset seeks in api_get_contacts
+        db.Index('idx_contacts_name_id', 'name', 'id'),
+        # Keeps MAX(updated_at) in data_version() an index lookup
+        db.Index('idx_contacts_updated_at', 'updated_at'),
+    )
+    
     # Relationship with tags
     tags = db.relationship('Tag', secondary='contact_tags', backref=db.backref('contacts', lazy='dynamic'))
     
+    @property
+    def metadata_dict(self):
+        """Parsed metadata, cached until the raw column value changes."""
+        raw = self.meta
+        cached = self.__dict__.get('_meta_cache')
+        if cached is None or cached[0] is not raw:
+            cached = (raw, _json_loads(raw) if raw else {})
+            self.__dict__['_meta_cache'] = cached
+        return cached[1]
+    
     def to_dict(self):
         """Convert contact to dictionary with metadata and tags."""
-        metadata_dict = json.loads(self.metadata) if self.metadata else {}
+        metadata_dict = dict(self.metadata_dict)
         return {
             'id': self.id,
             'name': self.name,
@@ -82,28 +171,99 @@ def validate_email(email):
     """Validate email format."""
     if not email:
         return True
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
-
-def get_or_create_tag(tag_name):
-    """Get existing tag or create new one."""
-    tag = Tag.query.filter_by(name=tag_name).first()
-    if not tag:
-        tag = Tag(name=tag_name)
-        db.session.add(tag)
-        db.session.commit()
-    return tag
+    return _EMAIL_RE.match(email) is not None
+
+def encode_cursor(contact):
+    """Opaque keyset cursor pointing just past the given contact."""
+    raw = json.dumps({'name': contact.name, 'id': contact.id}).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor):
+    """Return (name, id) from a cursor, or None if it is malformed."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return data['name'], int(data['id'])
+    except (ValueError, TypeError, KeyError):
+        return None
+
+def get_or_create_tags(tag_names):
+    """Get existing tags or create new ones, in the order given.
+    
+    Existing tags are fetched with one IN query; missing ones are added to the
+    session and saved with the caller's commit.
+    """
+    names = list(dict.fromkeys(tag_names))
+    if not names:
+        return []
+    tags = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(names)).all()}
+    missing = [Tag(name=name) for name in names if name not in tags]
+    if missing:
+        db.session.add_all(missing)
+        tags.update((tag.name, tag) for tag in missing)
+    return [tags[name] for name in names]
+
+def data_version():
+    """Cheap fingerprint of the contacts, tags and contact_tags tables.
+    
+    Edits move MAX(updated_at), deletes change the row count, and tag links
+    are counted. Endpoints that relink tags also bump updated_at, so a swap
+    that keeps the count still changes the version.
+    """
+    return db.session.execute(text(
+        "SELECT (SELECT COALESCE(MAX(updated_at), '') || '/' || COUNT(*) FROM contacts)"
+        " || '/' || (SELECT COUNT(*) FROM contact_tags)"
+        " || '/' || (SELECT COUNT(*) || '/' || COALESCE(MAX(id), 0) FROM tags)"
+    )).scalar()
+
+def etag_cached(view):
+    """Serve a GET view from an in-memory LRU keyed on data_version().
+    
+    The response carries an ETag derived from the version and query string,
+    and a matching If-None-Match is answered with 304 before any rendering.
+    """
+    @lru_cache(maxsize=128)
+    def render(version, args):
+        response = app.make_response(view())
+        return response.get_data(), response.status_code, response.mimetype
+    
+    @wraps(view)
+    def wrapper():
+        version = data_version()
+        args = tuple(sorted(request.args.items(multi=True)))
+        etag = hashlib.sha1(repr((request.path, version, args)).encode()).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        body, status, mimetype = render(version, args)
+        response = app.response_class(body, status=status, mimetype=mimetype)
+        if status == 200:
+            response.set_etag(etag)
+        return response
+    
+    return wrapper
 
 # REST API Endpoints
 @app.route('/api/contacts', methods=['GET'])
+@etag_cached
 def api_get_contacts():
-    """Get all contacts with optional filtering and pagination."""
+    """Get all contacts with optional filtering and pagination.
+    
+    Pass ``cursor`` (the ``next_cursor`` of a previous response) to seek past
+    the last row seen instead of paging with ``page``, which uses OFFSET.
+    """
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     search = request.args.get('search', '')
     tag = request.args.get('tag', '')
+    cursor = request.args.get('cursor')
+    
+    if per_page < 1:
+        return jsonify({'error': 'per_page must be at least 1'}), 400
     
-    query = Contact.query
+    # Load the page's tags in one extra IN query instead of one per contact
+    query = Contact.query.options(selectinload(Contact.tags))
     
     # Apply search filter
     if search:
@@ -119,6 +279,28 @@ def api_get_contacts():
     if tag:
         query = query.join(Contact.tags).filter(Tag.name == tag)
     
+    query = query.order_by(Contact.name, Contact.id)
+    
+    # Keyset pagination: seek past the cursor row, fetching one extra row to
+    # learn whether another page follows
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        rows = query.filter(tuple_(Contact.name, Contact.id) > position) \
+            .limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        
+        return jsonify({
+            'contacts': [contact.to_dict() for contact in rows],
+            'pagination': {
+                'per_page': per_page,
+                'has_next': has_next,
+                'next_cursor': encode_cursor(rows[-1]) if has_next else None
+            }
+        })
+    
     # Apply pagination
     pagination = query.paginate(
         page=page, per_page=per_page, error_out=False
@@ -134,7 +316,8 @@ def api_get_contacts():
             'total': pagination.total,
             'pages': pagination.pages,
             'has_next': pagination.has_next,
-            'has_prev': pagination.has_prev
+            'has_prev': pagination.has_prev,
+            'next_cursor': encode_cursor(pagination.items[-1]) if pagination.has_next else None
         }
     })
 
@@ -160,13 +343,11 @@ def api_create_contact():
         email=data.get('email'),
         phone=data.get('phone'),
         address=data.get('address'),
-        metadata=json.dumps(data.get('metadata', {}))
+        meta=_json_dumps(data.get('metadata', {}))
     )
     
     # Add tags
-    for tag_name in data.get('tags', []):
-        tag = get_or_create_tag(tag_name)
-        contact.tags.append(tag)
+    contact.tags.extend(get_or_create_tags(data.get('tags', [])))
     
     db.session.add(contact)
     db.session.commit()
@@ -205,14 +386,13 @@ def api_update_contact(contact_id):
     if 'address' in data:
         contact.address = data['address']
     if 'metadata' in data:
-        contact.metadata = json.dumps(data['metadata'])
+        contact.meta = _json_dumps(data['metadata'])
     
     # Update tags
     if 'tags' in data:
         contact.tags.clear()
-        for tag_name in data['tags']:
-            tag = get_or_create_tag(tag_name)
-            contact.tags.append(tag)
+        contact.updated_at = datetime.utcnow()
+        contact.tags.extend(get_or_create_tags(data['tags']))
     
     db.session.commit()
     return jsonify(contact.to_dict())
@@ -228,25 +408,40 @@ def api_delete_contact(contact_id):
 @app.route('/api/contacts/<int:contact_id>/metadata', methods=['PATCH'])
 def api_update_metadata(contact_id):
     """Update specific metadata fields for a contact."""
-    contact = Contact.query.get_or_404(contact_id)
     data = request.get_json()
-    
-    current_metadata = json.loads(contact.metadata) if contact.metadata else {}
-    current_metadata.update(data)
-    contact.metadata = json.dumps(current_metadata)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Metadata patch must be a JSON object'}), 400
+    
+    # Merge in SQLite with json_patch instead of parsing and re-dumping the
+    # stored blob in Python
+    result = db.session.execute(
+        text("UPDATE contacts SET metadata = json_patch(COALESCE(metadata, '{}'), :patch), "
+             "updated_at = :now WHERE id = :id")
+            .bindparams(bindparam('now', type_=db.DateTime)),
+        {'patch': _json_dumps(data), 'now': datetime.utcnow(), 'id': contact_id}
+    )
+    if result.rowcount == 0:
+        db.session.rollback()
+        abort(404)
     
     db.session.commit()
+    contact = Contact.query.get_or_404(contact_id)
     return jsonify(contact.to_dict())
 
 @app.route('/api/tags', methods=['GET'])
+@etag_cached
 def api_get_tags():
     """Get all tags with contact counts."""
-    tags = Tag.query.all()
+    # Count through the junction table in one grouped query rather than
+    # loading each tag's contacts separately
+    rows = db.session.query(Tag, func.count(contact_tags.c.contact_id)) \
+        .outerjoin(contact_tags, contact_tags.c.tag_id == Tag.id) \
+        .group_by(Tag.id).all()
     result = []
     
-    for tag in tags:
+    for tag, contact_count in rows:
         tag_dict = tag.to_dict()
-        tag_dict['contact_count'] = len(tag.contacts)
+        tag_dict['contact_count'] = contact_count
         result.append(tag_dict)
     
     return jsonify(result)
@@ -280,7 +475,7 @@ def index():
     search = request.args.get('search', '')
     tag = request.args.get('tag', '')
     
-    query = Contact.query
+    query = Contact.query.options(selectinload(Contact.tags))
     
     if search:
         query = query.filter(
@@ -337,9 +532,7 @@ def new_contact():
         )
         
         # Add tags
-        for tag_name in tags:
-            tag = get_or_create_tag(tag_name)
-            contact.tags.append(tag)
+        contact.tags.extend(get_or_create_tags(tags))
         
         db.session.add(contact)
         db.session.commit()
@@ -366,9 +559,8 @@ def edit_contact(contact_id):
         tags = request.form.get('tags', '').split(',')
         tags = [tag.strip() for tag in tags if tag.strip()]
         contact.tags.clear()
-        for tag_name in tags:
-            tag = get_or_create_tag(tag_name)
-            contact.tags.append(tag)
+        contact.updated_at = datetime.utcnow()
+        contact.tags.extend(get_or_create_tags(tags))
         
         db.session.commit()
         
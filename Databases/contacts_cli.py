@@ -5,18 +5,99 @@ A comprehensive CLI app that reads a JSON file of contacts, loads them into an S
 and provides advanced features including analytics, backup/restore, and performance monitoring.
 """
 
+import atexit
 import json
 import sqlite3
 import click
 from tabulate import tabulate
 from colorama import init, Fore, Style
 import os
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import csv
 import time
 import hashlib
-import shutil
 from collections import defaultdict, Counter
+from functools import lru_cache
+from itertools import chain
+
+try:
+    import ijson
+except ImportError:
+    # ijson is optional; without it the whole file is parsed up front
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; the json module covers the same calls, slower
+    orjson = None
+
+# Errors raised for a malformed contacts file by either parser
+JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
+
+# Contacts inserted per executemany() while streaming a JSON file
+LOAD_BATCH_SIZE = 1000
+
+# Files smaller than this are parsed in one go, which is faster than
+# streaming them through ijson when the whole document fits in memory
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+# Pages copied per step of an online backup; between steps other
+# connections can take the database lock
+BACKUP_STEP_PAGES = 1024
+
+# Distinct lookup/list results kept in memory between writes
+READ_CACHE_SIZE = 128
+
+# Columns display_contacts() shows, in the order its rows must carry them.
+# idx_contacts_display covers all of them in name order.
+DISPLAY_COLUMNS = 'id, name, email, phone, company, job_title, tags, created_at'
+
+# Statements run on every call, kept as constants so the connection's
+# statement cache gets the same string back and never re-prepares them
+_SQL_INSERT_CONTACT = '''
+    INSERT INTO contacts (name, email, phone, address, company, job_title, notes, tags)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_LOAD_CONTACT = '''
+    INSERT OR REPLACE INTO contacts
+    (name, email, phone, address, company, job_title, notes, tags)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+# One SELECT per column, so each is a range scan on its NOCASE index; an OR
+# of the three lets the planner pick a full scan of idx_contacts_display
+_SQL_LOOKUP_PREFIX = f'''
+    SELECT {DISPLAY_COLUMNS} FROM contacts WHERE name LIKE ? ESCAPE '\\'
+    UNION
+    SELECT {DISPLAY_COLUMNS} FROM contacts WHERE email LIKE ? ESCAPE '\\'
+    UNION
+    SELECT {DISPLAY_COLUMNS} FROM contacts WHERE company LIKE ? ESCAPE '\\'
+    ORDER BY name
+'''
+_SQL_LOOKUP_FTS = '''
+    SELECT c.id, c.name, c.email, c.phone, c.company, c.job_title, c.tags, c.created_at
+    FROM contacts_fts f JOIN contacts c ON c.id = f.rowid
+    WHERE contacts_fts MATCH ?
+    ORDER BY c.name
+'''
+_SQL_LOOKUP_SCAN = f'''
+    SELECT {DISPLAY_COLUMNS}
+    FROM contacts
+    WHERE name LIKE ? OR email LIKE ? OR company LIKE ? OR tags LIKE ?
+    ORDER BY name
+'''
+_SQL_LIST_ALL = '''
+    SELECT id, name, email, phone, address, company, job_title, notes, tags, created_at, updated_at
+    FROM contacts
+    ORDER BY name
+'''
+_SQL_LIST_DISPLAY = f'''
+    SELECT {DISPLAY_COLUMNS}
+    FROM contacts
+    ORDER BY name
+'''
+_SQL_CONTACT_NAME = 'SELECT name FROM contacts WHERE id = ?'
+_SQL_DELETE_CONTACT = 'DELETE FROM contacts WHERE id = ?'
 
 # Initialize colorama for cross-platform colored output
 init()
@@ -24,6 +105,15 @@ init()
 class ContactManager:
     def __init__(self, db_path="contacts.db"):
         self.db_path = db_path
+        # One connection for the manager's lifetime, so per-connection PRAGMAs
+        # and the page cache carry over between calls
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+        atexit.register(self._conn.close)
+        # Lookup and list results, keyed by the data version they were read
+        # at. Every write bumps the version and clears the cache, so a read
+        # that overlaps a write can never be served to later callers.
+        self._version = 0
+        self._read_cache = lru_cache(maxsize=READ_CACHE_SIZE)(self._read)
         self.init_database()
         self.performance_stats = {
             'queries_executed': 0,
@@ -33,9 +123,17 @@ class ContactManager:
     
     def init_database(self):
         """Initialize the SQLite database with the contacts table and indexes."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             
+            # WAL lets a commit append to the log instead of syncing the main
+            # file; NORMAL only fsyncs at checkpoints, which is safe under WAL
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            # ~20 MB page cache; it lives as long as the shared connection
+            cursor.execute('PRAGMA cache_size=-20000')
+            
             # Create contacts table with enhanced schema
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS contacts (
@@ -58,6 +156,17 @@ class ContactManager:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_company ON contacts(company)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_created_at ON contacts(created_at)')
+            # LIKE is case-insensitive, so prefix lookups can only range-scan
+            # NOCASE indexes
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_name_nocase ON contacts(name COLLATE NOCASE)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_email_nocase ON contacts(email COLLATE NOCASE)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_company_nocase ON contacts(company COLLATE NOCASE)')
+            # Covers DISPLAY_COLUMNS (id is the rowid), so listings and LIKE
+            # scans read names in order without touching the table or sorting
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS idx_contacts_display '
+                'ON contacts(name, email, phone, company, job_title, tags, created_at)'
+            )
             
             # Create triggers for updated_at timestamp
             cursor.execute('''
@@ -68,8 +177,68 @@ class ContactManager:
                 END
             ''')
             
+            self.fts_enabled = self._init_fts(cursor)
+            
             conn.commit()
     
+    def _init_fts(self, cursor):
+        """Create the trigram full-text index used by lookup_contact.
+        
+        contacts_fts indexes the searched columns of contacts as an external
+        content table. Triggers keep it in sync. Returns False when this SQLite
+        build lacks FTS5 or the trigram tokenizer, and lookups then scan.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'contacts_fts'")
+        exists = cursor.fetchone() is not None
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                    name, email, company, tags,
+                    content='contacts', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts
+            BEGIN
+                INSERT INTO contacts_fts (rowid, name, email, company, tags)
+                VALUES (NEW.id, NEW.name, NEW.email, NEW.company, NEW.tags);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts
+            BEGIN
+                INSERT INTO contacts_fts (contacts_fts, rowid, name, email, company, tags)
+                VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.company, OLD.tags);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts
+            BEGIN
+                INSERT INTO contacts_fts (contacts_fts, rowid, name, email, company, tags)
+                VALUES ('delete', OLD.id, OLD.name, OLD.email, OLD.company, OLD.tags);
+                INSERT INTO contacts_fts (rowid, name, email, company, tags)
+                VALUES (NEW.id, NEW.name, NEW.email, NEW.company, NEW.tags);
+            END
+        ''')
+        # INSERT OR REPLACE deletes the row holding a clashing email without
+        # firing delete triggers, so drop that row from the index first
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_replace BEFORE INSERT ON contacts
+            WHEN NEW.email IS NOT NULL
+            BEGIN
+                INSERT INTO contacts_fts (contacts_fts, rowid, name, email, company, tags)
+                SELECT 'delete', id, name, email, company, tags FROM contacts WHERE email = NEW.email;
+            END
+        ''')
+        
+        if not exists:
+            # Index the contacts already in an older database
+            cursor.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')")
+        return True
+    
     def _measure_performance(self, func):
         """Decorator to measure query performance"""
         def wrapper(*args, **kwargs):
@@ -98,68 +267,168 @@ class ContactManager:
             return False
         
         try:
-            with open(json_file, 'r') as f:
-                contacts = json.load(f)
-            
-            with sqlite3.connect(self.db_path) as conn:
+            with open(json_file, 'rb') as f, self._conn as conn:
                 cursor = conn.cursor()
                 loaded_count = 0
                 
-                for contact in contacts:
-                    try:
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO contacts 
-                            (name, email, phone, address, company, job_title, notes, tags)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            contact.get('name', ''),
-                            contact.get('email', ''),
-                            contact.get('phone', ''),
-                            contact.get('address', ''),
-                            contact.get('company', ''),
-                            contact.get('job_title', ''),
-                            contact.get('notes', ''),
-                            contact.get('tags', '')
-                        ))
-                        loaded_count += 1
-                    except sqlite3.IntegrityError as e:
-                        click.echo(f"{Fore.YELLOW}Warning: Skipping duplicate contact {contact.get('name', 'Unknown')}: {e}{Style.RESET_ALL}")
+                # One transaction for the whole file. SQLite takes the whole
+                # document when it can; otherwise contacts are fed in batches
+                # as they are parsed
+                cursor.execute('BEGIN')
+                document_count = self._insert_json_document(cursor, f)
+                if document_count is not None:
+                    loaded_count = document_count
+                else:
+                    batch = []
+                    for contact in self._iter_json_contacts(f):
+                        batch.append(contact)
+                        if len(batch) == LOAD_BATCH_SIZE:
+                            loaded_count += self._insert_contact_batch(cursor, batch)
+                            batch = []
+                    if batch:
+                        loaded_count += self._insert_contact_batch(cursor, batch)
                 
                 conn.commit()
+                self._data_changed()
                 click.echo(f"{Fore.GREEN}Successfully loaded {loaded_count} contacts from {json_file}{Style.RESET_ALL}")
                 return True
                 
-        except json.JSONDecodeError:
+        except JSON_ERRORS:
             click.echo(f"{Fore.RED}Error: Invalid JSON format in {json_file}{Style.RESET_ALL}")
             return False
         except Exception as e:
             click.echo(f"{Fore.RED}Error loading contacts: {e}{Style.RESET_ALL}")
             return False
     
-    def lookup_contact(self, search_term):
-        """Look up contacts by name, email, company, or tags."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+    def _insert_json_document(self, cursor, f):
+        """Insert a whole contacts file with one INSERT ... SELECT over json_each.
+        
+        SQLite parses the document itself, so no Python object is built per
+        contact. Returns the number of contacts stored, or None with f rewound
+        when the file is too big to hold in memory, is not an array of objects,
+        or has a row that breaks a constraint. The caller then loads it in
+        batches, which reports or skips those cases.
+        """
+        if os.fstat(f.fileno()).st_size >= STREAM_MIN_BYTES:
+            return None
+        
+        columns = ('name', 'email', 'phone', 'address', 'company', 'job_title', 'notes', 'tags')
+        # A missing key becomes '' as with contact.get(key, ''); null stays NULL
+        values = ', '.join(
+            f"CASE WHEN json_type(value, '$.{column}') IS NULL THEN '' "
+            f"ELSE json_extract(value, '$.{column}') END"
+            for column in columns
+        )
+        try:
+            document = f.read().decode('utf-8')
             cursor.execute('''
-                SELECT id, name, email, phone, address, company, job_title, notes, tags, created_at, updated_at
-                FROM contacts
-                WHERE name LIKE ? OR email LIKE ? OR company LIKE ? OR tags LIKE ?
-                ORDER BY name
-            ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-            
-            contacts = cursor.fetchall()
-            return contacts
+                SELECT CASE WHEN json_valid(?1) AND json_type(?1) = 'array'
+                    THEN NOT EXISTS (SELECT 1 FROM json_each(?1) WHERE type <> 'object')
+                    ELSE 0 END
+            ''', (document,))
+            if cursor.fetchone()[0]:
+                cursor.execute('SAVEPOINT load_document')
+                try:
+                    cursor.execute(f'''
+                        INSERT OR REPLACE INTO contacts ({', '.join(columns)})
+                        SELECT {values} FROM json_each(?)
+                    ''', (document,))
+                    loaded_count = cursor.rowcount
+                    cursor.execute('RELEASE load_document')
+                    return loaded_count
+                except sqlite3.IntegrityError:
+                    cursor.execute('ROLLBACK TO load_document')
+                    cursor.execute('RELEASE load_document')
+        except (UnicodeDecodeError, sqlite3.OperationalError):
+            # Not UTF-8, or a SQLite build without the JSON functions
+            pass
+        f.seek(0)
+        return None
+    
+    def _iter_json_contacts(self, f):
+        """Yield the contacts in a JSON array file.
+        
+        Large files are streamed with ijson when it is installed; anything
+        else is parsed whole, with orjson when available.
+        """
+        if ijson is not None and os.fstat(f.fileno()).st_size >= STREAM_MIN_BYTES:
+            return ijson.items(f, 'item', use_float=True)
+        if orjson is not None:
+            return iter(orjson.loads(f.read()))
+        return iter(json.load(f))
+    
+    def _insert_contact_batch(self, cursor, contacts):
+        """Insert a batch of contact dicts and return how many were stored.
+        
+        The batch goes through a single executemany() under a savepoint. If any
+        row violates a constraint, the savepoint is rolled back and the batch is
+        retried row by row, skipping only the offending contacts.
+        """
+        rows = [(
+            contact.get('name', ''),
+            contact.get('email', ''),
+            contact.get('phone', ''),
+            contact.get('address', ''),
+            contact.get('company', ''),
+            contact.get('job_title', ''),
+            contact.get('notes', ''),
+            contact.get('tags', '')
+        ) for contact in contacts]
+        
+        cursor.execute('SAVEPOINT load_batch')
+        try:
+            cursor.executemany(_SQL_LOAD_CONTACT, rows)
+            loaded_count = len(rows)
+        except sqlite3.IntegrityError:
+            cursor.execute('ROLLBACK TO load_batch')
+            loaded_count = 0
+            for contact, row in zip(contacts, rows):
+                try:
+                    cursor.execute(_SQL_LOAD_CONTACT, row)
+                    loaded_count += 1
+                except sqlite3.IntegrityError as e:
+                    click.echo(f"{Fore.YELLOW}Warning: Skipping duplicate contact {contact.get('name', 'Unknown')}: {e}{Style.RESET_ALL}")
+        cursor.execute('RELEASE load_batch')
+        return loaded_count
+    
+    def _read(self, version, sql, params=()):
+        """Run a read-only query for the read cache; version only keys it."""
+        return self._conn.execute(sql, params).fetchall()
+    
+    def _data_changed(self):
+        """Invalidate cached reads after a write."""
+        self._version += 1
+        self._read_cache.cache_clear()
+    
+    def lookup_contact(self, search_term, prefix=False):
+        """Look up contacts by name, email, company, or tags.
+        
+        Rows hold DISPLAY_COLUMNS. With prefix=True only names, emails and
+        companies starting with the term match, which SQLite answers with
+        range scans on their indexes. Repeated lookups are served from the
+        read cache until the next write.
+        """
+        if prefix:
+            pattern = search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            return self._read_cache(self._version, _SQL_LOOKUP_PREFIX, (pattern, pattern, pattern)).copy()
+        
+        # Trigrams need at least three characters, and LIKE wildcards in the
+        # term keep their pattern meaning, so those cases still scan
+        if self.fts_enabled and len(search_term) >= 3 and not any(c in search_term for c in '%_'):
+            query = '"' + search_term.replace('"', '""') + '"'
+            return self._read_cache(self._version, _SQL_LOOKUP_FTS, (query,)).copy()
+        
+        pattern = f'%{search_term}%'
+        return self._read_cache(self._version, _SQL_LOOKUP_SCAN, (pattern, pattern, pattern, pattern)).copy()
     
     def add_contact(self, name, email=None, phone=None, address=None, company=None, job_title=None, notes=None, tags=None):
         """Add a new contact to the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._conn as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO contacts (name, email, phone, address, company, job_title, notes, tags)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (name, email, phone, address, company, job_title, notes, tags))
+                cursor.execute(_SQL_INSERT_CONTACT, (name, email, phone, address, company, job_title, notes, tags))
                 conn.commit()
+                self._data_changed()
                 click.echo(f"{Fore.GREEN}Contact '{name}' added successfully!{Style.RESET_ALL}")
                 return True
         except sqlite3.IntegrityError:
@@ -171,40 +440,42 @@ class ContactManager:
     
     def delete_contact(self, contact_id):
         """Delete a contact by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT name FROM contacts WHERE id = ?', (contact_id,))
+            cursor.execute(_SQL_CONTACT_NAME, (contact_id,))
             contact = cursor.fetchone()
             
             if not contact:
                 click.echo(f"{Fore.RED}Error: Contact with ID {contact_id} not found.{Style.RESET_ALL}")
                 return False
             
-            cursor.execute('DELETE FROM contacts WHERE id = ?', (contact_id,))
+            cursor.execute(_SQL_DELETE_CONTACT, (contact_id,))
             conn.commit()
+            self._data_changed()
             click.echo(f"{Fore.GREEN}Contact '{contact[0]}' deleted successfully!{Style.RESET_ALL}")
             return True
     
-    def list_all_contacts(self):
-        """List all contacts in the database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, name, email, phone, address, company, job_title, notes, tags, created_at, updated_at
-                FROM contacts
-                ORDER BY name
-            ''')
-            contacts = cursor.fetchall()
-            return contacts
+    def list_all_contacts(self, display_only=False):
+        """List all contacts in the database.
+        
+        Rows hold every column, or only DISPLAY_COLUMNS with display_only=True,
+        which is served straight from idx_contacts_display. Results come from
+        the read cache until the next write.
+        """
+        return self._read_cache(self._version, _SQL_LIST_DISPLAY if display_only else _SQL_LIST_ALL).copy()
+    
+    def iter_all_contacts(self):
+        """Yield every contact row, in list_all_contacts() order, one at a time."""
+        yield from self._conn.execute(_SQL_LIST_ALL)
     
     def update_contact(self, contact_id, **kwargs):
         """Update a contact by ID."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._conn as conn:
                 cursor = conn.cursor()
                 
                 # Check if contact exists
-                cursor.execute('SELECT name FROM contacts WHERE id = ?', (contact_id,))
+                cursor.execute(_SQL_CONTACT_NAME, (contact_id,))
                 contact = cursor.fetchone()
                 
                 if not contact:
@@ -230,6 +501,7 @@ class ContactManager:
                 
                 cursor.execute(query, values)
                 conn.commit()
+                self._data_changed()
                 
                 click.echo(f"{Fore.GREEN}Contact '{contact[0]}' updated successfully!{Style.RESET_ALL}")
                 return True
@@ -242,12 +514,18 @@ class ContactManager:
             return False
     
     def export_contacts(self, format='csv', filename=None):
-        """Export contacts to CSV or JSON format."""
-        contacts = self.list_all_contacts()
+        """Export contacts to CSV or JSON format.
         
-        if not contacts:
+        Rows are written as they are stepped off the cursor, so memory stays
+        flat however many contacts there are.
+        """
+        contacts = self.iter_all_contacts()
+        first = next(contacts, None)
+        
+        if first is None:
             click.echo(f"{Fore.YELLOW}No contacts to export.{Style.RESET_ALL}")
             return False
+        contacts = chain((first,), contacts)
         
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -269,24 +547,34 @@ class ContactManager:
                         ])
             
             elif format.lower() == 'json':
-                contacts_data = []
-                for contact in contacts:
-                    contacts_data.append({
-                        'id': contact[0],
-                        'name': contact[1],
-                        'email': contact[2],
-                        'phone': contact[3],
-                        'address': contact[4],
-                        'company': contact[5],
-                        'job_title': contact[6],
-                        'notes': contact[7],
-                        'tags': contact[8],
-                        'created_at': contact[9],
-                        'updated_at': contact[10]
-                    })
+                if orjson is not None:
+                    def dump(record):
+                        return orjson.dumps(record, default=str, option=orjson.OPT_INDENT_2)
+                else:
+                    def dump(record):
+                        return json.dumps(record, indent=2, default=str).encode('utf-8')
                 
-                with open(filename, 'w', encoding='utf-8') as jsonfile:
-                    json.dump(contacts_data, jsonfile, indent=2, default=str)
+                # One record at a time, laid out the way json.dump(indent=2)
+                # would lay out the whole list
+                with open(filename, 'wb') as jsonfile:
+                    jsonfile.write(b'[')
+                    for i, contact in enumerate(contacts):
+                        record = {
+                            'id': contact[0],
+                            'name': contact[1],
+                            'email': contact[2],
+                            'phone': contact[3],
+                            'address': contact[4],
+                            'company': contact[5],
+                            'job_title': contact[6],
+                            'notes': contact[7],
+                            'tags': contact[8],
+                            'created_at': contact[9],
+                            'updated_at': contact[10]
+                        }
+                        jsonfile.write(b',\n  ' if i else b'\n  ')
+                        jsonfile.write(dump(record).replace(b'\n', b'\n  '))
+                    jsonfile.write(b'\n]')
             
             click.echo(f"{Fore.GREEN}Contacts exported to {filename}{Style.RESET_ALL}")
             return True
@@ -302,7 +590,11 @@ class ContactManager:
             backup_path = f"contacts_backup_{timestamp}.db"
         
         try:
-            shutil.copy2(self.db_path, backup_path)
+            # The online backup API includes commits still in the WAL file,
+            # which a plain file copy would miss
+            with sqlite3.connect(backup_path) as backup:
+                self._conn.backup(backup, pages=BACKUP_STEP_PAGES, sleep=0.001)
+            backup.close()
             click.echo(f"{Fore.GREEN}Database backed up to {backup_path}{Style.RESET_ALL}")
             return True
         except Exception as e:
@@ -318,10 +610,19 @@ class ContactManager:
         try:
             # Create a backup of current database before restoring
             current_backup = f"contacts_pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-            shutil.copy2(self.db_path, current_backup)
+            with sqlite3.connect(current_backup) as backup:
+                self._conn.backup(backup, pages=BACKUP_STEP_PAGES, sleep=0.001)
+            backup.close()
             
-            # Restore from backup
-            shutil.copy2(backup_path, self.db_path)
+            # Restore from backup through the open connection, rather than
+            # copying over a file it holds open
+            with sqlite3.connect(backup_path) as source:
+                source.backup(self._conn)
+            source.close()
+            # The backup may predate the current schema; bring back the
+            # indexes, full-text table and triggers this manager relies on
+            self.init_database()
+            self._data_changed()
             
             click.echo(f"{Fore.GREEN}Database restored from {backup_path}{Style.RESET_ALL}")
             click.echo(f"{Fore.YELLOW}Previous database backed up to {current_backup}{Style.RESET_ALL}")
@@ -331,51 +632,83 @@ class ContactManager:
             return False
     
     def get_analytics(self):
-        """Get analytics about contacts."""
-        contacts = self.list_all_contacts()
+        """Get analytics about contacts.
         
-        if not contacts:
-            return {
-                'total_contacts': 0,
-                'companies': {},
-                'tags': {},
+        Each figure is aggregated by SQLite, so only the grouped counts and
+        the recent contacts come back to Python.
+        """
+        with self._conn as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM contacts')
+            total_contacts = cursor.fetchone()[0]
+            
+            if not total_contacts:
+                return {
+                    'total_contacts': 0,
+                    'companies': {},
+                    'tags': {},
+                    'recent_activity': [],
+                    'email_domains': {}
+                }
+            
+            analytics = {
+                'total_contacts': total_contacts,
+                'companies': Counter(),
+                'tags': Counter(),
                 'recent_activity': [],
-                'email_domains': {}
+                'email_domains': Counter()
             }
-        
-        analytics = {
-            'total_contacts': len(contacts),
-            'companies': Counter(),
-            'tags': Counter(),
-            'recent_activity': [],
-            'email_domains': Counter()
-        }
-        
-        for contact in contacts:
+            
             # Company statistics
-            if contact[5]:  # company
-                analytics['companies'][contact[5]] += 1
+            cursor.execute('''
+                SELECT company, COUNT(*) FROM contacts
+                WHERE company IS NOT NULL AND company <> ''
+                GROUP BY company
+            ''')
+            analytics['companies'].update(dict(cursor.fetchall()))
             
-            # Tags statistics
-            if contact[8]:  # tags
-                tags = [tag.strip() for tag in contact[8].split(',') if tag.strip()]
-                for tag in tags:
-                    analytics['tags'][tag] += 1
+            # Tags statistics: split the comma-separated lists with a
+            # recursive CTE, trimming whitespace around each tag
+            cursor.execute('''
+                WITH RECURSIVE split(tag, rest) AS (
+                    SELECT '', tags || ',' FROM contacts
+                    WHERE tags IS NOT NULL AND tags <> ''
+                    UNION ALL
+                    SELECT trim(substr(rest, 1, instr(rest, ',') - 1), char(32, 9, 10, 11, 12, 13)),
+                           substr(rest, instr(rest, ',') + 1)
+                    FROM split WHERE rest <> ''
+                )
+                SELECT tag, COUNT(*) FROM split WHERE tag <> '' GROUP BY tag
+            ''')
+            analytics['tags'].update(dict(cursor.fetchall()))
             
-            # Email domain statistics
-            if contact[2]:  # email
-                domain = contact[2].split('@')[-1] if '@' in contact[2] else 'unknown'
-                analytics['email_domains'][domain] += 1
+            # Email domain statistics: the text after the last '@'. rtrim()
+            # strips every character but '@' from the right, leaving the
+            # local part and the '@' to skip
+            cursor.execute('''
+                SELECT CASE WHEN instr(email, '@') > 0
+                            THEN substr(email, length(rtrim(email, replace(email, '@', ''))) + 1)
+                            ELSE 'unknown' END AS domain,
+                       COUNT(*)
+                FROM contacts
+                WHERE email IS NOT NULL AND email <> ''
+                GROUP BY domain
+            ''')
+            analytics['email_domains'].update(dict(cursor.fetchall()))
             
-            # Recent activity (contacts created in last 30 days)
-            if contact[9]:  # created_at
-                created_date = datetime.strptime(contact[9][:10], '%Y-%m-%d')
-                if (datetime.now() - created_date).days <= 30:
-                    analytics['recent_activity'].append({
-                        'name': contact[1],
-                        'created_at': contact[9],
-                        'company': contact[5]
-                    })
+            # Recent activity (contacts created in last 30 days). A timestamp
+            # compares >= the cutoff date exactly when its date part does,
+            # so idx_contacts_created_at can serve the range
+            recent_cutoff = (date.today() - timedelta(days=30)).isoformat()
+            cursor.execute('''
+                SELECT name, created_at, company FROM contacts
+                WHERE created_at >= ?
+                ORDER BY name
+            ''', (recent_cutoff,))
+            analytics['recent_activity'] = [
+                {'name': name, 'created_at': created_at, 'company': company}
+                for name, created_at, company in cursor.fetchall()
+            ]
         
         return analytics
     
@@ -394,7 +727,7 @@ class ContactManager:
         }
 
 def display_contacts(contacts, title="Contacts"):
-    """Display contacts in a formatted table."""
+    """Display contacts, given as rows of DISPLAY_COLUMNS, in a formatted table."""
     if not contacts:
         click.echo(f"{Fore.YELLOW}No contacts found.{Style.RESET_ALL}")
         return
@@ -408,10 +741,10 @@ def display_contacts(contacts, title="Contacts"):
             contact[1],
             contact[2] or "",
             contact[3] or "",
+            contact[4] or "",
             contact[5] or "",
             contact[6] or "",
-            contact[8] or "",
-            contact[9][:10] if contact[9] else ""
+            contact[7][:10] if contact[7] else ""
         ])
     
     click.echo(f"\n{Fore.CYAN}{title}{Style.RESET_ALL}")
@@ -462,11 +795,12 @@ def load(ctx, json_file):
 
 @cli.command()
 @click.argument('search_term')
+@click.option('--prefix', is_flag=True, help='Only match names, emails or companies starting with the term')
 @click.pass_context
-def lookup(ctx, search_term):
+def lookup(ctx, search_term, prefix):
     """Look up contacts by name, email, company, or tags."""
     manager = ctx.obj['manager']
-    contacts = manager.lookup_contact(search_term)
+    contacts = manager.lookup_contact(search_term, prefix=prefix)
     display_contacts(contacts, f"Search Results for '{search_term}'")
 
 @cli.command()
@@ -497,7 +831,7 @@ def delete(ctx, contact_id):
 def list(ctx):
     """List all contacts."""
     manager = ctx.obj['manager']
-    contacts = manager.list_all_contacts()
+    contacts = manager.list_all_contacts(display_only=True)
     display_contacts(contacts, "All Contacts")
 
 @cli.command()